@@ -0,0 +1,200 @@
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import time
+
+import cv2
+import numpy as np
+
+from face_blurring import blur_faces, detect_faces_multi_method, resolve_model_files
+
+DEFAULT_DETECTORS = ['haar', 'dnn', 'yunet']
+DEFAULT_BLUR_STRENGTHS = [5, 15, 45]
+DEFAULT_VIDEO_GLOB = os.path.join('recordings', '*.avi')
+
+
+def load_frames(video_path, frame_count):
+    """Decode a recording into memory, looping it until frame_count frames are available"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video: {video_path}")
+
+    decoded = []
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            decoded.append(frame)
+    finally:
+        cap.release()
+
+    if not decoded:
+        raise IOError(f"No frames could be read from: {video_path}")
+
+    # Replay the clip from the start so every run sees the same number of frames
+    return [decoded[i % len(decoded)] for i in range(frame_count)]
+
+
+def percentile_summary(latencies_ms):
+    """Return mean and percentile latencies (milliseconds) for a list of samples (None for no samples)"""
+    samples = np.asarray(latencies_ms, dtype=np.float64)
+    if samples.size == 0:
+        return dict.fromkeys(['mean', 'p50', 'p90', 'p95', 'p99', 'max'])
+    return {
+        'mean': float(samples.mean()),
+        'p50': float(np.percentile(samples, 50)),
+        'p90': float(np.percentile(samples, 90)),
+        'p95': float(np.percentile(samples, 95)),
+        'p99': float(np.percentile(samples, 99)),
+        'max': float(samples.max()),
+    }
+
+
+def run_case(frames, detector_type, blur_strength, confidence=0.7, warmup=10):
+    """Benchmark one detector/blur combination on pre-decoded frames"""
+    # Warmup: first calls pay for model loading and allocator growth
+    for frame in frames[:warmup]:
+        faces = detect_faces_multi_method(frame, detector_type, confidence)
+        blur_faces(frame, faces, blur_strength)
+
+    detect_ms = []
+    total_ms = []
+    faces_found = 0
+    frames_with_faces = 0
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+
+    for frame in frames:
+        t0 = time.perf_counter()
+        faces = detect_faces_multi_method(frame, detector_type, confidence)
+        t1 = time.perf_counter()
+        blur_faces(frame, faces, blur_strength)
+        t2 = time.perf_counter()
+
+        detect_ms.append((t1 - t0) * 1000)
+        total_ms.append((t2 - t0) * 1000)
+        faces_found += len(faces)
+        frames_with_faces += 1 if len(faces) > 0 else 0
+
+    wall_elapsed = time.perf_counter() - wall_start
+    cpu_elapsed = time.process_time() - cpu_start
+
+    return {
+        'detector': detector_type,
+        'blur_strength': blur_strength,
+        'confidence': confidence,
+        'frames': len(frames),
+        'warmup_frames': min(warmup, len(frames)),
+        'fps': len(frames) / wall_elapsed if wall_elapsed > 0 else 0.0,
+        'wall_seconds': wall_elapsed,
+        # Process CPU time over wall time; OpenCV is single-threaded here, so ~100% means CPU-bound
+        # and anything lower is time spent waiting
+        'cpu_percent': (cpu_elapsed / wall_elapsed) * 100 if wall_elapsed > 0 else 0.0,
+        'detect_latency_ms': percentile_summary(detect_ms),
+        'frame_latency_ms': percentile_summary(total_ms),
+        'faces_found': faces_found,
+        'frames_with_faces': frames_with_faces,
+        'faces_per_frame': faces_found / len(frames) if frames else 0.0,
+    }
+
+
+def run_benchmark(video_paths, detectors, blur_strengths, frame_count=300, warmup=10, confidence=0.7):
+    """Replay each video through every detector and blur strength headlessly"""
+    results = []
+
+    for video_path in video_paths:
+        try:
+            frames = load_frames(video_path, frame_count)
+        except IOError as e:
+            print(f"❌ Skipping {video_path}: {e}")
+            continue
+        h, w = frames[0].shape[:2]
+        print(f"🎞️  {video_path}: {w}x{h}, {frame_count} frames (warmup {warmup})")
+
+        for detector_type in detectors:
+            for blur_strength in blur_strengths:
+                case = run_case(frames, detector_type, blur_strength, confidence, warmup)
+                case['video'] = video_path
+                case['resolution'] = [w, h]
+                results.append(case)
+
+                print(f"  {detector_type:6} blur={blur_strength:3}  "
+                      f"{case['fps']:7.1f} FPS  "
+                      f"p50={case['frame_latency_ms']['p50']:6.2f}ms  "
+                      f"p99={case['frame_latency_ms']['p99']:6.2f}ms  "
+                      f"CPU={case['cpu_percent']:5.1f}%  "
+                      f"faces={case['faces_found']}")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recordings through the face detectors and report speed")
+    parser.add_argument('videos', nargs='*', help=f"Video files to replay (default: {DEFAULT_VIDEO_GLOB})")
+    parser.add_argument('--detectors', nargs='+', default=DEFAULT_DETECTORS, choices=DEFAULT_DETECTORS)
+    parser.add_argument('--blur', nargs='+', type=int, default=DEFAULT_BLUR_STRENGTHS, help="Blur strengths to test")
+    parser.add_argument('--frames', type=int, default=300, help="Timed frames per run (clips are looped)")
+    parser.add_argument('--warmup', type=int, default=10, help="Untimed warmup frames per run")
+    parser.add_argument('--confidence', type=float, default=0.7)
+    parser.add_argument('--output', default=None, help="JSON results file (default: benchmarks/detectors_<timestamp>.json)")
+    args = parser.parse_args()
+    if args.frames < 1:
+        parser.error("--frames must be at least 1")
+    if args.warmup < 0:
+        parser.error("--warmup must not be negative")
+
+    video_paths = args.videos or sorted(glob.glob(DEFAULT_VIDEO_GLOB))
+    if not video_paths:
+        print(f"❌ No videos found matching {DEFAULT_VIDEO_GLOB}")
+        return
+
+    # Missing models make the detector silently fall back to Haar, which would skew the comparison
+    for detector_type in args.detectors:
+        if detector_type != 'haar' and resolve_model_files(detector_type) is None:
+            print(f"⚠️  {detector_type} model files not available or unverified - '{detector_type}' results will measure the fallback chain")
+
+    # Single-threaded OpenCV keeps runs comparable between machines and loads
+    cv2.setNumThreads(1)
+
+    results = run_benchmark(video_paths, args.detectors, args.blur, args.frames, args.warmup, args.confidence)
+    if not results:
+        print("❌ None of the videos could be read - no results to save")
+        return
+
+    output = args.output
+    if output is None:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs('benchmarks', exist_ok=True)
+        output = os.path.join('benchmarks', f"detectors_{timestamp}.json")
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'opencv': cv2.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'opencv_threads': cv2.getNumThreads(),
+        },
+        'settings': {
+            'frames': args.frames,
+            'warmup': args.warmup,
+            'confidence': args.confidence,
+        },
+        'results': results,
+    }
+
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n📄 Benchmark results saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
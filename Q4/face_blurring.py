@@ -1,34 +1,195 @@
 import cv2
 import numpy as np
 import datetime
+import hashlib
 import os
+import threading
+import time
+
+# Model files are resolved offline from a local cache directory (see MODEL_REGISTRY)
+MODEL_CACHE_DIR = os.environ.get("FACE_BLUR_MODEL_DIR", "models")
+MODEL_MANIFEST_FILE = "models.sha256"  # "<sha256>  <filename>" per line, as written by sha256sum
+# Files without a checksum in the manifest are refused unless this is set to 1
+TRUST_UNVERIFIED_MODELS = os.environ.get("FACE_BLUR_TRUST_UNVERIFIED_MODELS") == "1"
 
-# DNN model files (will be downloaded automatically if not present)
 DNN_MODEL_URL = "https://github.com/opencv/opencv/raw/master/samples/dnn/face_detector/"
 DNN_MODEL_FILE = "opencv_face_detector_uint8.pb"
 DNN_CONFIG_FILE = "opencv_face_detector.pbtxt"
+YUNET_MODEL_FILE = "face_detection_yunet_2023mar.onnx"
+
+MODEL_REGISTRY = {
+    'dnn': [DNN_MODEL_FILE, DNN_CONFIG_FILE],
+    'yunet': [YUNET_MODEL_FILE],
+}
+
+# Loaded models are shared by every detection call; the warmup thread fills these in
+_loaded_models = {}
+_failed_models = {}
+_model_lock = threading.Lock()
+_warmup_thread = None
+_haar_cascade = None
 
-def download_dnn_model():
-    """Download DNN model files if they don't exist"""
-    if not os.path.exists(DNN_MODEL_FILE) or not os.path.exists(DNN_CONFIG_FILE):
+def download_dnn_model(cache_dir=MODEL_CACHE_DIR):
+    """Download DNN model files into the model cache (explicit opt-in, never called at startup)"""
+    os.makedirs(cache_dir, exist_ok=True)
+    model_path = os.path.join(cache_dir, DNN_MODEL_FILE)
+    config_path = os.path.join(cache_dir, DNN_CONFIG_FILE)
+    if not os.path.exists(model_path) or not os.path.exists(config_path):
         print("⚠️  DNN model files not found. Downloading...")
         try:
             import urllib.request
-            urllib.request.urlretrieve(f"{DNN_MODEL_URL}{DNN_MODEL_FILE}", DNN_MODEL_FILE)
-            urllib.request.urlretrieve(f"{DNN_MODEL_URL}{DNN_CONFIG_FILE}", DNN_CONFIG_FILE)
+            urllib.request.urlretrieve(f"{DNN_MODEL_URL}{DNN_MODEL_FILE}", model_path)
+            urllib.request.urlretrieve(f"{DNN_MODEL_URL}{DNN_CONFIG_FILE}", config_path)
             print("✅ DNN model files downloaded successfully!")
         except Exception as e:
             print(f"❌ Failed to download DNN model: {e}")
             return False
     return True
 
+def file_sha256(path):
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_model_manifest(cache_dir=MODEL_CACHE_DIR):
+    """Read expected checksums from the cache manifest ({filename: sha256})"""
+    manifest_path = os.path.join(cache_dir, MODEL_MANIFEST_FILE)
+    manifest = {}
+    if not os.path.exists(manifest_path):
+        return manifest
+
+    with open(manifest_path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2:
+                checksum, filename = parts
+                manifest[filename.lstrip('*')] = checksum.lower()
+    return manifest
+
+def write_model_manifest(cache_dir=MODEL_CACHE_DIR):
+    """Record checksums of the model files currently in the cache (run once after provisioning)"""
+    lines = []
+    for filenames in MODEL_REGISTRY.values():
+        for filename in filenames:
+            path = os.path.join(cache_dir, filename)
+            if os.path.exists(path):
+                lines.append(f"{file_sha256(path)}  {filename}")
+
+    with open(os.path.join(cache_dir, MODEL_MANIFEST_FILE), 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    return len(lines)
+
+def resolve_model_files(name, cache_dir=MODEL_CACHE_DIR, trust_unverified=None):
+    """
+    Find the files for a registered model locally and verify their checksums.
+    Looks in the cache directory first, then the working directory. Never touches the network.
+    Returns the list of paths, or None if a file is missing, has no checksum in the manifest
+    (unless trust_unverified, default TRUST_UNVERIFIED_MODELS) or fails verification.
+    """
+    if trust_unverified is None:
+        trust_unverified = TRUST_UNVERIFIED_MODELS
+    manifest = load_model_manifest(cache_dir)
+    paths = []
+
+    for filename in MODEL_REGISTRY[name]:
+        candidates = [os.path.join(cache_dir, filename), filename]
+        path = next((c for c in candidates if os.path.exists(c)), None)
+        if path is None:
+            return None
+
+        expected = manifest.get(filename)
+        if expected is None:
+            if not trust_unverified:
+                print(f"❌ No checksum for {filename} in {MODEL_MANIFEST_FILE}; refusing to load it unverified")
+                return None
+            print(f"⚠️  No checksum for {filename} in {MODEL_MANIFEST_FILE}; using it unverified")
+        elif file_sha256(path) != expected:
+            print(f"❌ Checksum mismatch for {path}; refusing to load it")
+            return None
+
+        paths.append(path)
+
+    return paths
+
+def _build_model(name, paths):
+    if name == 'dnn':
+        return cv2.dnn.readNetFromTensorflow(paths[0], paths[1])
+    if name == 'yunet':
+        return cv2.FaceDetectorYN.create(paths[0], "", (320, 320), 0.8, 0.3, 5000)
+    raise ValueError(f"Unknown model: {name}")
+
+def _warm_model(name, model):
+    """Run one inference on a blank frame so the first real frame does not pay for it"""
+    blank = np.zeros((300, 300, 3), dtype=np.uint8)
+    if name == 'dnn':
+        model.setInput(cv2.dnn.blobFromImage(blank, 1.0, (300, 300), [104, 117, 123]))
+        model.forward()
+    elif name == 'yunet':
+        model.setInputSize((300, 300))
+        model.detect(blank)
+
+def _load_model(name):
+    """Resolve, build and warm up one model, recording the outcome (caller holds _model_lock)"""
+    if name in _loaded_models or name in _failed_models:
+        return _loaded_models.get(name)
+
+    start = time.perf_counter()
+    try:
+        paths = resolve_model_files(name)
+        if paths is None:
+            raise FileNotFoundError(f"files missing or unverified in '{MODEL_CACHE_DIR}' / working directory")
+        model = _build_model(name, paths)
+        _warm_model(name, model)
+    except Exception as e:
+        _failed_models[name] = str(e)
+        print(f"❌ {name} model unavailable: {e}")
+        return None
+
+    _loaded_models[name] = model
+    print(f"✅ {name} model ready ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return model
+
+def _warmup_worker(names):
+    for name in names:
+        with _model_lock:
+            _load_model(name)
+
+def start_model_warmup(names=('yunet', 'dnn')):
+    """Load and warm up models on a background thread; detectors use Haar until they are ready"""
+    global _warmup_thread
+    if _warmup_thread is None:
+        _warmup_thread = threading.Thread(target=_warmup_worker, args=(tuple(names),), daemon=True)
+        _warmup_thread.start()
+    return _warmup_thread
+
+def get_model(name):
+    """
+    Return a loaded model, or None if it is unavailable.
+    While the background warmup is still running this returns None instead of blocking;
+    without a warmup thread the model is loaded on first use.
+    """
+    model = _loaded_models.get(name)
+    if model is not None or name in _failed_models:
+        return model
+
+    if _warmup_thread is not None and _warmup_thread.is_alive():
+        return None
+
+    with _model_lock:
+        return _load_model(name)
+
 def detect_faces_haar(frame):
     """Haar Cascade face detector (fast but less accurate)"""
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    global _haar_cascade
+    if _haar_cascade is None:
+        _haar_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
     
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
     
-    faces = face_cascade.detectMultiScale(
+    faces = _haar_cascade.detectMultiScale(
         gray,
         scaleFactor=1.1,
         minNeighbors=6,
@@ -40,15 +201,12 @@ def detect_faces_haar(frame):
 
 def detect_faces_dnn(frame, confidence_threshold=0.7):
     """DNN-based face detector (more accurate but slower)"""
-    # Check if model files exist
-    if not os.path.exists(DNN_MODEL_FILE) or not os.path.exists(DNN_CONFIG_FILE):
-        print("❌ DNN model files missing. Falling back to Haar cascade.")
+    # Haar covers for the DNN while it is loading or if its files are missing
+    net = get_model('dnn')
+    if net is None:
         return detect_faces_haar(frame)
     
     try:
-        # Load DNN model
-        net = cv2.dnn.readNetFromTensorflow(DNN_MODEL_FILE, DNN_CONFIG_FILE)
-        
         # Create blob from frame
         blob = cv2.dnn.blobFromImage(frame, 1.0, (300, 300), [104, 117, 123])
         net.setInput(blob)
@@ -85,20 +243,12 @@ def detect_faces_dnn(frame, confidence_threshold=0.7):
 
 def detect_faces_yunet(frame, confidence_threshold=0.8):
     """YuNet face detector (modern, accurate)"""
+    detector = get_model('yunet')
+    if detector is None:
+        return detect_faces_dnn(frame)
+    
     try:
-        # Initialize YuNet detector
-        detector = cv2.FaceDetectorYN.create(
-            "face_detection_yunet_2023mar.onnx",  # Model file
-            "",
-            (320, 320),  # Input size
-            confidence_threshold,
-            0.3,  # NMS threshold
-            5000  # Top K
-        )
-        
-        if detector is None:
-            print("❌ YuNet model not available. Falling back to DNN.")
-            return detect_faces_dnn(frame)
+        detector.setScoreThreshold(confidence_threshold)
         
         # Set input size
         h, w = frame.shape[:2]
@@ -133,8 +283,220 @@ def detect_faces_multi_method(frame, detector_type='haar', confidence=0.7):
     else:
         return detect_faces_haar(frame)  # Default fallback
 
-def blur_faces(frame, faces, blur_strength=15):
-    """Blur detected faces with adjustable strength"""
+def detect_faces_scaled(frame, detector_type='haar', confidence=0.7, scale=1.0):
+    """Run detection on a downscaled copy of the frame and map boxes back to full size"""
+    if scale >= 1.0:
+        return detect_faces_multi_method(frame, detector_type, confidence)
+
+    small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    faces = detect_faces_multi_method(small, detector_type, confidence)
+
+    return [[int(x / scale), int(y / scale), int(w / scale), int(h / scale)] for (x, y, w, h) in faces]
+
+# Adaptive ladder, best quality first: (detector, detection scale)
+ADAPTIVE_LEVELS = [
+    ('yunet', 1.0),
+    ('yunet', 0.75),
+    ('dnn', 1.0),
+    ('haar', 1.0),
+    ('haar', 0.75),
+    ('haar', 0.5),
+]
+
+class AdaptiveDetector:
+    """Steps between detectors and detection resolutions to keep detection within a latency budget"""
+
+    def __init__(self, target_ms=33.0, levels=ADAPTIVE_LEVELS, smoothing=0.2,
+                 headroom=0.6, cooldown_frames=30):
+        self.target_ms = target_ms
+        self.levels = list(levels)
+        self.smoothing = smoothing          # EMA weight of the newest sample
+        self.headroom = headroom            # step up only when cost < headroom * target
+        self.cooldown_frames = cooldown_frames
+        self.level = 0
+        self.cost_ms = [None] * len(self.levels)  # smoothed cost per level, measured online
+        self.frames_since_switch = 0
+        self.switches = []
+
+    @property
+    def detector_type(self):
+        return self.levels[self.level][0]
+
+    @property
+    def scale(self):
+        return self.levels[self.level][1]
+
+    def _model_ready(self, level):
+        """Haar is always loaded; other detectors only count once their model is, or Haar stands in"""
+        detector = self.levels[level][0]
+        return detector == 'haar' or detector in _loaded_models
+
+    def _model_failed(self, level):
+        detector = self.levels[level][0]
+        return detector != 'haar' and detector in _failed_models
+
+    def detect(self, frame, confidence=0.7, record=True):
+        """
+        Detect faces at the current level, then update cost estimates and maybe switch level
+        record=False (e.g. the motion gate ran on a crop) leaves costs and level untouched.
+        """
+        ready = self._model_ready(self.level)
+        start = time.perf_counter()
+        faces = detect_faces_scaled(frame, self.detector_type, confidence, self.scale)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if not record:
+            return faces
+
+        # A level whose model could not be loaded would only ever run a fallback
+        if self._model_failed(self.level) and self.level < len(self.levels) - 1:
+            self._switch(self.level + 1, elapsed_ms)
+            return faces
+
+        # While the model is still warming up a fallback ran; its cost says nothing about this level
+        if not ready:
+            return faces
+
+        previous = self.cost_ms[self.level]
+        self.frames_since_switch += 1
+
+        if previous is None:
+            # The first frame on a level pays for model loading, so it is not counted
+            if self.frames_since_switch > 1:
+                self.cost_ms[self.level] = elapsed_ms
+            return faces
+
+        self.cost_ms[self.level] = previous + self.smoothing * (elapsed_ms - previous)
+        self._update_level()
+
+        return faces
+
+    def _update_level(self):
+        cost = self.cost_ms[self.level]
+
+        # Over budget: step down to the next cheaper level
+        if cost > self.target_ms and self.level < len(self.levels) - 1:
+            self._switch(self.level + 1, cost)
+            return
+
+        # Well under budget: try the next better level once things have settled
+        if (self.level > 0 and self.frames_since_switch >= self.cooldown_frames
+                and cost < self.headroom * self.target_ms and not self._model_failed(self.level - 1)):
+            better_cost = self.cost_ms[self.level - 1]
+            if better_cost is None or better_cost < self.target_ms or self.frames_since_switch >= self.cooldown_frames * 10:
+                self._switch(self.level - 1, cost)
+
+    def _switch(self, new_level, cost):
+        old_detector, old_scale = self.levels[self.level]
+        new_detector, new_scale = self.levels[new_level]
+        direction = "⬇️" if new_level > self.level else "⬆️"
+        event = {
+            'time': datetime.datetime.now().isoformat(timespec='milliseconds'),
+            'from': (old_detector, old_scale),
+            'to': (new_detector, new_scale),
+            'cost_ms': cost,
+            'target_ms': self.target_ms,
+        }
+        self.switches.append(event)
+        print(f"{direction} Adaptive: {old_detector}@{old_scale:.2f} -> {new_detector}@{new_scale:.2f} "
+              f"(detection {cost:.1f}ms, budget {self.target_ms:.1f}ms)")
+
+        self.level = new_level
+        self.frames_since_switch = 0
+
+class MotionGate:
+    """Reuses the previous face boxes while the scene is static and re-detects only where it changed"""
+
+    def __init__(self, scale=0.25, pixel_threshold=25, min_changed_fraction=0.002,
+                 scene_change_fraction=0.3, roi_padding=40, refresh_frames=90):
+        self.scale = scale                                  # size of the gray frame used for differencing
+        self.pixel_threshold = pixel_threshold              # per-pixel intensity change that counts as motion
+        self.min_changed_fraction = min_changed_fraction    # below this the frame is treated as unchanged
+        self.scene_change_fraction = scene_change_fraction  # above this the whole frame is re-detected
+        self.roi_padding = roi_padding                      # full-resolution pixels added around the changed area
+        self.refresh_frames = refresh_frames                # force a full detection at least this often
+        self.reference = None
+        self.faces = []
+        self.frames_since_full = 0
+        self.last_action = 'full'
+        self.stats = {'full': 0, 'roi': 0, 'skip': 0}
+
+    def _small_gray(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def detect(self, frame, detect_fn):
+        """Return face boxes for frame, calling detect_fn(image) only when the scene changed"""
+        small = self._small_gray(frame)
+
+        if self.reference is None or self.reference.shape != small.shape or self.frames_since_full >= self.refresh_frames:
+            return self._full(frame, small, detect_fn)
+
+        changed = cv2.absdiff(small, self.reference) > self.pixel_threshold
+        changed_fraction = np.count_nonzero(changed) / changed.size
+
+        if changed_fraction < self.min_changed_fraction:
+            self.frames_since_full += 1
+            self.last_action = 'skip'
+            self.stats['skip'] += 1
+            return self.faces
+
+        if changed_fraction > self.scene_change_fraction:
+            return self._full(frame, small, detect_fn)
+
+        # Bounding box of the changed pixels, mapped back to full resolution and padded
+        cx, cy, cw, ch = cv2.boundingRect(changed.astype(np.uint8))
+        h, w = frame.shape[:2]
+        x1 = max(0, int(cx / self.scale) - self.roi_padding)
+        y1 = max(0, int(cy / self.scale) - self.roi_padding)
+        x2 = min(w, int((cx + cw) / self.scale) + self.roi_padding)
+        y2 = min(h, int((cy + ch) / self.scale) + self.roi_padding)
+
+        # Grow the region over every previous box it touches, so the crop never cuts a face in half
+        # (growing can reach further boxes, so repeat until nothing changes)
+        grown = True
+        while grown:
+            grown = False
+            for fx, fy, fw, fh in self.faces:
+                outside = fx + fw <= x1 or fx >= x2 or fy + fh <= y1 or fy >= y2
+                if outside:
+                    continue
+                nx1, ny1 = max(0, min(x1, fx)), max(0, min(y1, fy))
+                nx2, ny2 = min(w, max(x2, fx + fw)), min(h, max(y2, fy + fh))
+                if (nx1, ny1, nx2, ny2) != (x1, y1, x2, y2):
+                    x1, y1, x2, y2 = nx1, ny1, nx2, ny2
+                    grown = True
+
+        # A region covering most of the frame costs as much as a full pass
+        if (x2 - x1) * (y2 - y1) > 0.5 * w * h:
+            return self._full(frame, small, detect_fn)
+
+        roi_faces = [[fx + x1, fy + y1, fw, fh] for (fx, fy, fw, fh) in detect_fn(frame[y1:y2, x1:x2])]
+
+        # Previous boxes inside the region were re-detected with it; keep the ones entirely outside
+        kept = [face for face in self.faces
+                if face[0] + face[2] <= x1 or face[0] >= x2 or face[1] + face[3] <= y1 or face[1] >= y2]
+
+        self.faces = kept + roi_faces
+        self.reference = small
+        self.frames_since_full += 1
+        self.last_action = 'roi'
+        self.stats['roi'] += 1
+        return self.faces
+
+    def _full(self, frame, small, detect_fn):
+        self.faces = [list(face) for face in detect_fn(frame)]
+        self.reference = small
+        self.frames_since_full = 0
+        self.last_action = 'full'
+        self.stats['full'] += 1
+        return self.faces
+
+ANONYMIZATION_STYLES = ['gaussian', 'pixelate', 'solid']
+
+def blur_faces(frame, faces, blur_strength=15, style='gaussian'):
+    """Blur detected faces with adjustable strength (style: gaussian, pixelate or solid)"""
     blurred_frame = frame.copy()
     
     for (x, y, w, h) in faces:
@@ -146,12 +508,23 @@ def blur_faces(frame, faces, blur_strength=15):
             # Extract the face region
             face_region = frame[y1:y2, x1:x2]
             
-            # Calculate kernel size based on blur strength
-            kernel_size = blur_strength * 2 + 1
-            kernel_size = max(11, min(151, kernel_size))
-            
-            # Apply Gaussian blur
-            blurred_face = cv2.GaussianBlur(face_region, (kernel_size, kernel_size), 0)
+            if style == 'pixelate':
+                # Block size follows the face: 1/8 of its smaller side at the default strength
+                # (so at most 8 blocks across), bigger blocks when stronger
+                block = max(2, -(-min(x2 - x1, y2 - y1) * blur_strength // 120))
+                blocks_x = max(1, (x2 - x1) // block)
+                blocks_y = max(1, (y2 - y1) // block)
+                small = cv2.resize(face_region, (blocks_x, blocks_y), interpolation=cv2.INTER_AREA)
+                blurred_face = cv2.resize(small, (x2 - x1, y2 - y1), interpolation=cv2.INTER_NEAREST)
+            elif style == 'solid':
+                blurred_face = np.zeros_like(face_region)
+            else:
+                # Calculate kernel size based on blur strength
+                kernel_size = blur_strength * 2 + 1
+                kernel_size = max(11, min(151, kernel_size))
+                
+                # Apply Gaussian blur
+                blurred_face = cv2.GaussianBlur(face_region, (kernel_size, kernel_size), 0)
             
             # Replace the face region with the blurred version
             blurred_frame[y1:y2, x1:x2] = blurred_face
@@ -159,6 +532,10 @@ def blur_faces(frame, faces, blur_strength=15):
     return blurred_frame
 
 def main():
+    # Load DNN/YuNet in the background; frames start flowing through Haar straight away
+    start_model_warmup()
+    detect_faces_haar(np.zeros((64, 64, 3), dtype=np.uint8))
+    
     # Initialize video capture
     cap = cv2.VideoCapture(0)
     
@@ -177,9 +554,6 @@ def main():
     
     print(f"Video properties: {width}x{height} at {fps} FPS")
     
-    # Download DNN models if needed
-    download_dnn_model()
-    
     # Application settings
     is_recording = False
     video_writer = None
@@ -196,6 +570,15 @@ def main():
     current_detector_index = 0
     detection_confidence = 0.7
     
+    # Adaptive mode: pick detector/resolution automatically to fit the frame budget
+    adaptive_mode = False
+    target_frame_ms = 1000.0 / fps
+    adaptive_detector = AdaptiveDetector(target_ms=target_frame_ms)
+    
+    # Motion gate: skip detection on static frames (fixed cameras)
+    motion_gate_enabled = False
+    motion_gate = MotionGate()
+    
     # Create recordings directory
     os.makedirs('recordings', exist_ok=True)
     
@@ -206,6 +589,8 @@ def main():
     print("+ - Increase blur strength")
     print("- - Decrease blur strength")
     print("m - Switch detection model")
+    print("a - Toggle adaptive detector (latency budget)")
+    print("g - Toggle motion gate (skip detection on static frames)")
     print("c - Increase detection confidence")
     print("v - Decrease detection confidence")
     print("d - Toggle debug mode")
@@ -230,8 +615,17 @@ def main():
             frame = cv2.flip(frame, 1)
             
             # Detect faces using current method
-            current_detector_type = detectors[current_detector_index][0]
-            faces = detect_faces_multi_method(frame, current_detector_type, detection_confidence)
+            if adaptive_mode:
+                # Only full-frame detections say what a level costs; motion-gate crops do not
+                detect_fn = lambda image: adaptive_detector.detect(image, detection_confidence, record=image is frame)
+            else:
+                current_detector_type = detectors[current_detector_index][0]
+                detect_fn = lambda image: detect_faces_multi_method(image, current_detector_type, detection_confidence)
+            
+            if motion_gate_enabled:
+                faces = motion_gate.detect(frame, detect_fn)
+            else:
+                faces = detect_fn(frame)
             
             # Blur faces
             processed_frame = blur_faces(frame, faces, blur_strength)
@@ -242,7 +636,10 @@ def main():
                         cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
             y_offset += 25
             
-            detector_display = detectors[current_detector_index][1].split(' ')[0]
+            if adaptive_mode:
+                detector_display = f"{adaptive_detector.detector_type}@{adaptive_detector.scale:.2f} (auto)"
+            else:
+                detector_display = detectors[current_detector_index][1].split(' ')[0]
             cv2.putText(processed_frame, f"Detector: {detector_display}", (10, y_offset), 
                         cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
             y_offset += 20
@@ -255,6 +652,11 @@ def main():
             cv2.putText(processed_frame, f"Confidence: {detection_confidence:.2f}", (10, y_offset), 
                         cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 150, 255), 1)
             
+            if motion_gate_enabled:
+                y_offset += 20
+                cv2.putText(processed_frame, f"Gate: {motion_gate.last_action}", (10, y_offset), 
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 255, 150), 1)
+            
             # Debug mode - show face boxes and confidence
             if show_debug:
                 for (x, y, w, h) in faces:
@@ -318,11 +720,30 @@ def main():
                     print(f"🔻 Blur strength: {blur_strength} (Kernel: {kernel_size}x{kernel_size})")
             
             elif key == ord('m'):
-                # Switch detection model
+                # Switch detection model (manual choice overrides adaptive mode)
+                if adaptive_mode:
+                    adaptive_mode = False
+                    print("🤖 Adaptive detector: OFF")
                 current_detector_index = (current_detector_index + 1) % len(detectors)
                 detector_name = detectors[current_detector_index][1]
                 print(f"🔁 Detection model: {detector_name}")
             
+            elif key == ord('a'):
+                adaptive_mode = not adaptive_mode
+                if adaptive_mode:
+                    print(f"🤖 Adaptive detector: ON (budget {adaptive_detector.target_ms:.1f}ms per frame)")
+                else:
+                    print(f"🤖 Adaptive detector: OFF ({len(adaptive_detector.switches)} switches)")
+            
+            elif key == ord('g'):
+                motion_gate_enabled = not motion_gate_enabled
+                motion_gate.reference = None  # start from a fresh full detection
+                if motion_gate_enabled:
+                    print("🚦 Motion gate: ON")
+                else:
+                    stats = motion_gate.stats
+                    print(f"🚦 Motion gate: OFF (full {stats['full']}, region {stats['roi']}, skipped {stats['skip']})")
+            
             elif key == ord('c'):
                 # Increase detection confidence
                 old_confidence = detection_confidence
@@ -0,0 +1,176 @@
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from face_blurring import ANONYMIZATION_STYLES, MotionGate, blur_faces, detect_faces_multi_method
+
+# Sidecar layout (NumPy .npz):
+#   offsets  int64 [frames + 1]  faces of frame i are boxes[offsets[i]:offsets[i + 1]]
+#   boxes    int32 [faces, 4]    x, y, w, h in full-resolution pixels
+#   frame_size int32 [2]         width, height of the source video
+SIDECAR_VERSION = 1
+
+
+def sidecar_file(path):
+    """np.savez appends .npz to paths without it; apply the same rule when loading"""
+    return path if path.endswith('.npz') else path + '.npz'
+
+
+def save_face_track(path, frame_faces, frame_size, detector_type=''):
+    """Write per-frame face boxes to a compact sidecar file"""
+    counts = np.array([len(faces) for faces in frame_faces], dtype=np.int64)
+    offsets = np.zeros(len(frame_faces) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    boxes = np.zeros((int(offsets[-1]), 4), dtype=np.int32)
+    for i, faces in enumerate(frame_faces):
+        if len(faces):
+            boxes[offsets[i]:offsets[i + 1]] = np.asarray(faces, dtype=np.int32).reshape(-1, 4)
+
+    np.savez(sidecar_file(path),
+             version=np.int32(SIDECAR_VERSION),
+             offsets=offsets,
+             boxes=boxes,
+             frame_size=np.array(frame_size, dtype=np.int32),
+             detector=np.array(detector_type))
+
+
+def load_face_track(path):
+    """Load a sidecar written by save_face_track; returns (offsets, boxes, frame_size)"""
+    path = sidecar_file(path)
+    with np.load(path) as data:
+        version = int(data['version'])
+        if version != SIDECAR_VERSION:
+            raise ValueError(f"Unsupported sidecar version {version} in {path}")
+        return data['offsets'], data['boxes'], tuple(int(v) for v in data['frame_size'])
+
+
+def open_video(input_path, output_path=None):
+    """Open the input video and, if output_path is given, a matching XVID writer"""
+    cap = cv2.VideoCapture(input_path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video: {input_path}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    writer = None
+    if output_path:
+        fourcc = cv2.VideoWriter_fourcc(*'XVID')
+        writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+
+    return cap, writer, (width, height)
+
+
+def detect_pass(input_path, sidecar_path, output_path=None, detector_type='haar', confidence=0.7,
+                blur_strength=15, style='gaussian', use_motion_gate=False):
+    """First pass: detect faces on every frame and record them in a sidecar (optionally rendering too)"""
+    cap, writer, frame_size = open_video(input_path, output_path)
+    gate = MotionGate() if use_motion_gate else None
+    frame_faces = []
+
+    start = time.perf_counter()
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            detect_fn = lambda image: detect_faces_multi_method(image, detector_type, confidence)
+            faces = gate.detect(frame, detect_fn) if gate else detect_fn(frame)
+            frame_faces.append([list(face) for face in faces])
+
+            if writer is not None:
+                writer.write(blur_faces(frame, faces, blur_strength, style))
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
+
+    save_face_track(sidecar_path, frame_faces, frame_size, detector_type)
+    elapsed = time.perf_counter() - start
+    total_faces = sum(len(faces) for faces in frame_faces)
+    print(f"🔍 Detected {total_faces} faces in {len(frame_faces)} frames ({elapsed:.2f}s)")
+    print(f"💾 Face track saved: {sidecar_file(sidecar_path)}")
+
+
+def render_pass(input_path, sidecar_path, output_path, blur_strength=15, style='gaussian'):
+    """Re-render a video from its sidecar: no face detection is run"""
+    offsets, boxes, frame_size = load_face_track(sidecar_path)
+    frames_in_track = len(offsets) - 1
+
+    cap, writer, video_size = open_video(input_path, output_path)
+    start = time.perf_counter()
+    frame_index = 0
+    complete = False
+    try:
+        if video_size != frame_size:
+            raise ValueError(f"Sidecar was recorded at {frame_size}, video is {video_size}")
+
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            # Never write a frame the sidecar has no boxes for: it would go out unblurred
+            if frame_index >= frames_in_track:
+                raise ValueError(f"Video has more frames than the sidecar ({frames_in_track}); "
+                                 f"re-run the detect pass for {input_path}")
+
+            faces = boxes[offsets[frame_index]:offsets[frame_index + 1]]
+            writer.write(blur_faces(frame, faces, blur_strength, style))
+            frame_index += 1
+
+        if frame_index != frames_in_track:
+            raise ValueError(f"Video has {frame_index} frames but the sidecar has {frames_in_track}; "
+                             f"re-run the detect pass for {input_path}")
+        complete = True
+    finally:
+        cap.release()
+        writer.release()
+        # A failed render never leaves a partial or empty video behind
+        if not complete and os.path.exists(output_path):
+            os.remove(output_path)
+
+    elapsed = time.perf_counter() - start
+    print(f"🎬 Rendered {frame_index} frames in {elapsed:.2f}s (style={style}, blur={blur_strength})")
+    print(f"💾 Output saved: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Two-pass face anonymization with a cached face track")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    detect = subparsers.add_parser('detect', help="Run detection once and save the face track sidecar")
+    detect.add_argument('input', help="Input video")
+    detect.add_argument('--sidecar', help="Sidecar path (default: <input>.faces.npz)")
+    detect.add_argument('--output', help="Also write a blurred video during this pass")
+    detect.add_argument('--detector', default='haar', choices=['haar', 'dnn', 'yunet'])
+    detect.add_argument('--confidence', type=float, default=0.7)
+    detect.add_argument('--blur', type=int, default=15)
+    detect.add_argument('--style', default='gaussian', choices=ANONYMIZATION_STYLES)
+    detect.add_argument('--motion-gate', action='store_true', help="Skip detection on static frames")
+
+    render = subparsers.add_parser('render', help="Re-render a video from its sidecar without detection")
+    render.add_argument('input', help="Input video (the same one used for 'detect')")
+    render.add_argument('output', help="Output video")
+    render.add_argument('--sidecar', help="Sidecar path (default: <input>.faces.npz)")
+    render.add_argument('--blur', type=int, default=15)
+    render.add_argument('--style', default='gaussian', choices=ANONYMIZATION_STYLES)
+
+    args = parser.parse_args()
+    sidecar = args.sidecar or f"{os.path.splitext(args.input)[0]}.faces.npz"
+
+    if args.command == 'detect':
+        detect_pass(args.input, sidecar, args.output, args.detector, args.confidence,
+                    args.blur, args.style, args.motion_gate)
+    else:
+        render_pass(args.input, sidecar, args.output, args.blur, args.style)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from face_blurring import (DNN_CONFIG_FILE, DNN_MODEL_FILE, MODEL_MANIFEST_FILE, file_sha256,
+                           resolve_model_files, write_model_manifest)
+from face_track_render import render_pass, save_face_track
+
+
+# ---------------- MODEL VERIFICATION ---------------- #
+
+@pytest.fixture
+def model_cache(tmp_path, monkeypatch):
+    """A model cache holding fake DNN files; the working directory is empty"""
+    cache_dir = tmp_path / "models"
+    cache_dir.mkdir()
+    (cache_dir / DNN_MODEL_FILE).write_bytes(b"weights")
+    (cache_dir / DNN_CONFIG_FILE).write_bytes(b"config")
+    monkeypatch.chdir(tmp_path)
+    return str(cache_dir)
+
+
+def test_verified_model_files_resolve(model_cache):
+    assert write_model_manifest(model_cache) == 2
+    assert resolve_model_files('dnn', model_cache) == [os.path.join(model_cache, DNN_MODEL_FILE),
+                                                        os.path.join(model_cache, DNN_CONFIG_FILE)]
+    assert resolve_model_files('yunet', model_cache) is None  # not in the cache at all
+
+
+def test_checksum_mismatch_is_refused(model_cache):
+    write_model_manifest(model_cache)
+    with open(os.path.join(model_cache, DNN_MODEL_FILE), 'ab') as f:
+        f.write(b"tampered")
+    assert resolve_model_files('dnn', model_cache) is None
+
+
+def test_missing_manifest_entry_is_refused(model_cache):
+    # Only the config is listed: the weights have no checksum to verify against
+    config_path = os.path.join(model_cache, DNN_CONFIG_FILE)
+    with open(os.path.join(model_cache, MODEL_MANIFEST_FILE), 'w') as f:
+        f.write(f"{file_sha256(config_path)}  {DNN_CONFIG_FILE}\n")
+    assert resolve_model_files('dnn', model_cache) is None
+    assert resolve_model_files('dnn', model_cache, trust_unverified=True) is not None
+
+
+def test_missing_manifest_is_refused(model_cache):
+    assert resolve_model_files('dnn', model_cache) is None
+    assert resolve_model_files('dnn', model_cache, trust_unverified=True) is not None
+
+
+# ---------------- FACE TRACK RENDER ---------------- #
+
+def write_video(path, frames, size=(160, 120)):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 10, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), i * 20, dtype=np.uint8))
+    writer.release()
+
+
+@pytest.mark.parametrize("frame_size, frames_in_track", [((320, 240), 5), ((160, 120), 4), ((160, 120), 6)])
+def test_mismatched_sidecar_leaves_no_output(tmp_path, frame_size, frames_in_track):
+    write_video(tmp_path / "input.avi", 5)
+    save_face_track(str(tmp_path / "input.faces"), [[]] * frames_in_track, frame_size)
+    output = tmp_path / "output.avi"
+    with pytest.raises(ValueError):
+        render_pass(str(tmp_path / "input.avi"), str(tmp_path / "input.faces"), str(output))
+    assert not output.exists()
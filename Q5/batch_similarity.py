@@ -0,0 +1,174 @@
+"""
+Quiet, streaming batch comparison of string pairs
+
+Reads pairs from a CSV or JSONL file, scores them with every similarity metric
+in worker processes and streams one structured record per pair to the output file.
+Memory use stays constant: only a bounded number of chunks is in flight at a time.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from string_similarity import align_strings, compare_strings, global_align
+
+ALIGNERS = {
+    'shift': align_strings,
+    'global': global_align,
+}
+
+RECORD_FIELDS = [
+    'str1', 'str2', 'exact_similarity', 'exact_matches', 'levenshtein_distance',
+    'levenshtein_similarity', 'jaccard_similarity', 'aligned_similarity',
+    'average_similarity', 'verdict',
+]
+
+
+def read_pairs(path):
+    """
+    Yield (str1, str2) pairs from a file, one at a time
+    CSV: first two columns (a header row 'str1,str2' is skipped)
+    JSONL: objects with str1/str2 keys, or two-element lists
+    """
+    if path.lower().endswith(('.jsonl', '.ndjson')):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                if isinstance(item, dict):
+                    yield item['str1'], item['str2']
+                else:
+                    yield item[0], item[1]
+    else:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row_number, row in enumerate(csv.reader(f)):
+                if len(row) < 2:
+                    continue
+                if row_number == 0 and row[0].strip().lower() == 'str1' and row[1].strip().lower() == 'str2':
+                    continue
+                yield row[0], row[1]
+
+
+def _compare_chunk(pairs, aligner_name):
+    """Worker: score one chunk of pairs (runs in a separate process)"""
+    aligner = ALIGNERS[aligner_name]
+    return [compare_strings(str1, str2, aligner) for str1, str2 in pairs]
+
+
+def _chunks(pairs, chunk_size):
+    iterator = iter(pairs)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def compare_pairs_stream(pairs, workers=None, chunk_size=1000, aligner='shift', max_pending=None):
+    """
+    Score an iterable of pairs in a process pool and yield records in input order
+    At most max_pending chunks (default 2 per worker) are queued, so memory does not grow with input size
+    workers=0 runs everything in the current process
+    """
+    if workers == 0:
+        for chunk in _chunks(pairs, chunk_size):
+            yield from _compare_chunk(chunk, aligner)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(pairs, chunk_size):
+            pending.append(executor.submit(_compare_chunk, chunk, aligner))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class RecordWriter:
+    """Streams records to a CSV or JSONL file, chosen by extension"""
+
+    def __init__(self, path):
+        self.path = path
+        self.is_jsonl = path.lower().endswith(('.jsonl', '.ndjson'))
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        if not self.is_jsonl:
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=RECORD_FIELDS)
+            self.csv_writer.writeheader()
+
+    def write(self, record):
+        if self.is_jsonl:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self.csv_writer.writerow(record)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def format_report(record):
+    """Render the human-readable summary for one record (only called when a report is requested)"""
+    lines = [
+        f"'{record['str1']}' vs '{record['str2']}'",
+        f"  Exact Position Similarity: {record['exact_similarity']:.2f}%",
+        f"  Levenshtein Similarity:    {record['levenshtein_similarity']:.2f}% "
+        f"({record['levenshtein_distance']} edits)",
+        f"  Jaccard Similarity:        {record['jaccard_similarity']:.2f}%",
+        f"  Aligned Similarity:        {record['aligned_similarity']:.2f}%",
+        f"  → {record['verdict']} (average {record['average_similarity']:.2f}%)",
+    ]
+    return "\n".join(lines)
+
+
+def run_batch(input_path, output_path, workers=None, chunk_size=1000, aligner='shift', report=0):
+    """Compare every pair in input_path and stream records to output_path; returns the pair count"""
+    count = 0
+    start = time.perf_counter()
+
+    with RecordWriter(output_path) as writer:
+        for record in compare_pairs_stream(read_pairs(input_path), workers, chunk_size, aligner):
+            writer.write(record)
+            if count < report:
+                print(format_report(record))
+            count += 1
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"✅ {count} pairs compared in {elapsed:.2f}s ({rate:.0f} pairs/s) → {output_path}", file=sys.stderr)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream similarity records for string pairs from CSV/JSONL")
+    parser.add_argument('input', help="Pairs file (.csv or .jsonl)")
+    parser.add_argument('output', help="Results file (.csv or .jsonl)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores, 0: no pool)")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Pairs per worker task")
+    parser.add_argument('--aligner', choices=sorted(ALIGNERS), default='shift',
+                        help="Alignment used for the aligned similarity")
+    parser.add_argument('--report', type=int, default=0, metavar='N',
+                        help="Print a human-readable report for the first N pairs")
+    args = parser.parse_args()
+
+    run_batch(args.input, args.output, args.workers, args.chunk_size, args.aligner, args.report)
+
+
+if __name__ == "__main__":
+    main()
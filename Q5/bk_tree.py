@@ -0,0 +1,147 @@
+"""
+BK-tree over the Levenshtein metric for duplicate and near-duplicate detection
+
+Nodes live in flat arrays (first child / next sibling / edge distance) and strings in
+one UTF-8 byte buffer, so a node costs a couple of dozen bytes instead of a dict per node.
+"""
+
+import heapq
+from array import array
+
+from string_similarity import levenshtein_distance, levenshtein_within
+
+
+class BKTree:
+    """BK-tree supporting incremental insertion, range queries and k-nearest-neighbour queries"""
+
+    def __init__(self):
+        self._text = bytearray()          # UTF-8 of every stored string, back to back
+        self._text_end = array('Q')       # end offset of node i's string in _text
+        self._first_child = array('i')    # -1 when the node has no children
+        self._next_sibling = array('i')   # -1 at the end of a sibling list
+        self._edge = array('H')           # distance from the parent
+        self._max_edge = array('H')       # largest edge among the node's children
+        self._count = array('I')          # how many times the string was inserted
+
+    def __len__(self):
+        return len(self._edge)
+
+    def string(self, node):
+        start = self._text_end[node - 1] if node > 0 else 0
+        return self._text[start:self._text_end[node]].decode('utf-8')
+
+    def count(self, node):
+        return self._count[node]
+
+    def _new_node(self, text, edge):
+        self._text.extend(text.encode('utf-8'))
+        self._text_end.append(len(self._text))
+        self._first_child.append(-1)
+        self._next_sibling.append(-1)
+        self._edge.append(edge)
+        self._max_edge.append(0)
+        self._count.append(1)
+        return len(self._edge) - 1
+
+    def insert(self, text):
+        """Add text; returns (node id, True) for a new string or (existing node id, False) for a duplicate"""
+        if not self._edge:
+            return self._new_node(text, 0), True
+
+        node = 0
+        while True:
+            # The exact distance is needed to pick the child edge
+            distance = levenshtein_distance(text, self.string(node))
+            if distance == 0:
+                self._count[node] += 1
+                return node, False
+
+            child = self._first_child[node]
+            last = -1
+            while child != -1 and self._edge[child] != distance:
+                last = child
+                child = self._next_sibling[child]
+
+            if child == -1:
+                new = self._new_node(text, distance)
+                if last == -1:
+                    self._first_child[node] = new
+                else:
+                    self._next_sibling[last] = new
+                if distance > self._max_edge[node]:
+                    self._max_edge[node] = distance
+                return new, True
+
+            node = child
+
+    def within(self, text, max_distance):
+        """All stored strings within max_distance of text, as [(string, distance)] sorted by distance"""
+        if not self._edge:
+            return []
+
+        results = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            # Beyond max_distance + the largest child edge, neither the node nor any child can qualify
+            bound = max_distance + self._max_edge[node]
+            distance = levenshtein_within(text, self.string(node), bound)
+            if distance > bound:
+                continue
+            if distance <= max_distance:
+                results.append((distance, node))
+
+            child = self._first_child[node]
+            while child != -1:
+                if abs(self._edge[child] - distance) <= max_distance:
+                    stack.append(child)
+                child = self._next_sibling[child]
+
+        results.sort()
+        return [(self.string(node), distance) for distance, node in results]
+
+    def nearest(self, text, k=1):
+        """The k stored strings closest to text, as [(string, distance)] sorted by distance"""
+        if not self._edge or k <= 0:
+            return []
+
+        best = []  # max-heap of (-distance, -node), at most k entries
+        queue = [(0, 0)]  # (lower bound on the subtree's distances, node)
+        while queue:
+            lower_bound, node = heapq.heappop(queue)
+            if len(best) == k and lower_bound >= -best[0][0]:
+                break  # nothing left can beat the current k-th best
+
+            if len(best) == k:
+                # Only distances below tau + the largest child edge can matter here
+                bound = -best[0][0] + self._max_edge[node]
+                distance = levenshtein_within(text, self.string(node), bound)
+                if distance > bound:
+                    continue
+            else:
+                distance = levenshtein_distance(text, self.string(node))
+
+            if len(best) < k:
+                heapq.heappush(best, (-distance, -node))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, -node))
+            tau = -best[0][0] if len(best) == k else None
+
+            child = self._first_child[node]
+            while child != -1:
+                # Triangle inequality: every string under child is at least |distance - edge| away
+                child_bound = abs(distance - self._edge[child])
+                if tau is None or child_bound < tau:
+                    heapq.heappush(queue, (child_bound, child))
+                child = self._next_sibling[child]
+
+        ranked = sorted((-distance, -node) for distance, node in best)
+        return [(self.string(node), distance) for distance, node in ranked]
+
+    def near_duplicates(self, max_distance=1):
+        """Yield (string, [(neighbour, distance), ...]) for every stored string that has neighbours"""
+        for node in range(len(self)):
+            text = self.string(node)
+            neighbours = [(other, d) for other, d in self.within(text, max_distance) if d > 0]
+            if neighbours:
+                yield text, neighbours
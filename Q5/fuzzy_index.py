@@ -0,0 +1,232 @@
+"""
+Top-k fuzzy search over a large string corpus with a q-gram inverted index
+
+Each corpus string is split into padded q-grams; the index maps every q-gram to the
+sorted ids of the strings containing it. A query looks for matches within a growing
+edit-distance radius: strings within distance d must share a minimum number of q-grams
+with the query (count filtering), which only the shortest posting lists need to be
+scanned to find (prefix filtering). Survivors are verified with the bulk Levenshtein distance.
+"""
+
+import argparse
+import time
+from array import array
+
+import numpy as np
+
+from string_similarity import levenshtein_distance_bulk, levenshtein_within
+
+PAD_START = '\x02'
+PAD_END = '\x03'
+SMALL_VERIFY_BATCH = 64  # below this many candidates verify one by one
+
+
+def qgram_keys(text, q):
+    """
+    Padded q-grams of text, each tagged with its occurrence number
+    ('AB' twice gives 'AB', 'AB\x001'), so plain set intersection counts shared
+    q-grams with multiplicity
+    """
+    padded = PAD_START * (q - 1) + text + PAD_END * (q - 1)
+    seen = {}
+    keys = []
+    for i in range(len(padded) - q + 1):
+        gram = padded[i:i + q]
+        occurrence = seen.get(gram, 0)
+        seen[gram] = occurrence + 1
+        keys.append(gram if occurrence == 0 else f"{gram}\x00{occurrence}")
+    return keys
+
+
+class QGramIndex:
+    """Inverted q-gram index with count-filtered top-k Levenshtein search"""
+
+    def __init__(self, q=3):
+        self.q = q
+        self.strings = []
+        self.lengths = np.zeros(0, dtype=np.int32)
+        self.gram_ids = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.postings = np.zeros(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.strings)
+
+    @classmethod
+    def build(cls, corpus, q=3):
+        """Index every string of corpus (an iterable); ids are positions in the corpus"""
+        index = cls(q)
+        gram_of_posting = array('i')
+        string_of_posting = array('i')
+
+        for string_id, text in enumerate(corpus):
+            index.strings.append(text)
+            for key in qgram_keys(text, q):
+                gram_id = index.gram_ids.setdefault(key, len(index.gram_ids))
+                gram_of_posting.append(gram_id)
+                string_of_posting.append(string_id)
+
+        index.lengths = np.fromiter(map(len, index.strings), dtype=np.int32, count=len(index.strings))
+
+        # Group postings by q-gram: ids stay sorted inside each list
+        grams = np.frombuffer(gram_of_posting, dtype=np.int32)
+        order = np.argsort(grams, kind='stable')
+        index.postings = np.frombuffer(string_of_posting, dtype=np.int32)[order].copy()
+        counts = np.bincount(grams, minlength=len(index.gram_ids))
+        index.offsets = np.zeros(len(index.gram_ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=index.offsets[1:])
+        return index
+
+    def _posting_lists(self, text):
+        """Posting lists of the query's q-grams that occur in the corpus, shortest first"""
+        lists = []
+        for key in qgram_keys(text, self.q):
+            gram_id = self.gram_ids.get(key)
+            if gram_id is not None:
+                lists.append(self.postings[self.offsets[gram_id]:self.offsets[gram_id + 1]])
+        lists.sort(key=len)
+        return lists
+
+    def _count_filter(self, lists, threshold):
+        """
+        Ids of strings appearing in at least threshold of the posting lists, with their counts
+        A string in >= threshold of m lists must be in one of the m - threshold + 1 shortest
+        (prefix filtering), so only those are scanned for candidates; the rest are probed
+        by binary search (ids are sorted inside every list)
+        """
+        threshold = max(threshold, 1)
+        if threshold > len(lists):
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64)
+
+        candidates = np.unique(np.concatenate(lists[:len(lists) - threshold + 1]))
+        shared = np.zeros(len(candidates), dtype=np.int64)
+        for ids in lists:
+            positions = np.searchsorted(ids, candidates)
+            found = positions < len(ids)
+            found[found] = ids[positions[found]] == candidates[found]
+            shared += found
+
+        keep = shared >= threshold
+        return candidates[keep], shared[keep]
+
+    def _within(self, text, lists, distance):
+        """All strings sharing a q-gram with text whose distance is <= distance, as (ids, distances)"""
+        # Strings within distance d share at least max_len + q - 1 - q*d padded q-grams
+        threshold = len(text) + self.q - 1 - self.q * distance
+        ids, shared = self._count_filter(lists, threshold)
+
+        lengths = self.lengths[ids]
+        max_len = np.maximum(lengths, len(text))
+        lower_bound = np.maximum(-((shared - max_len - self.q + 1) // self.q), np.abs(lengths - len(text)))
+        ids = ids[lower_bound <= distance]
+
+        if len(ids) <= SMALL_VERIFY_BATCH:
+            # NumPy call overhead dominates on a handful of pairs; the banded check is cheaper
+            distances = np.array([levenshtein_within(text, self.strings[i], distance) for i in ids], dtype=np.int64)
+        else:
+            distances = levenshtein_distance_bulk([text] * len(ids), [self.strings[i] for i in ids])
+        keep = distances <= distance
+        return ids[keep], distances[keep]
+
+    def search(self, text, k=5, max_distance=None):
+        """
+        The k corpus strings closest to text by Levenshtein distance
+        Returns [(string, distance, similarity %)] sorted by distance. Only strings sharing
+        at least one q-gram with text are considered; max_distance limits the distance.
+        """
+        lists = self._posting_lists(text)
+        if not lists:
+            return []
+
+        if max_distance is not None:
+            ids, distances = self._within(text, lists, max_distance)
+        else:
+            # Widen the radius until k strings are found; small radii allow strict count filters
+            distance = 0
+            while True:
+                ids, distances = self._within(text, lists, distance)
+                if len(ids) >= k:
+                    break
+                if len(text) + self.q - 1 - self.q * distance <= 1:
+                    # The filter no longer prunes anything: take every candidate
+                    ids, distances = self._within(text, lists, max(len(text), int(self.lengths.max())))
+                    break
+                distance += 1
+
+        order = np.lexsort((ids, distances))[:k]
+
+        results = []
+        for distance, string_id in zip(distances[order].tolist(), ids[order].tolist()):
+            match = self.strings[string_id]
+            longest = max(len(match), len(text))
+            similarity = ((longest - distance) / longest) * 100 if longest > 0 else 100.0
+            results.append((match, distance, similarity))
+        return results
+
+    def save(self, path):
+        """Write the index to a single .npz file"""
+        encoded = [s.encode('utf-8') for s in self.strings]
+        string_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=string_offsets[1:])
+
+        grams = sorted(self.gram_ids, key=self.gram_ids.get)
+        np.savez(path,
+                 q=np.int32(self.q),
+                 strings=np.frombuffer(b''.join(encoded), dtype=np.uint8),
+                 string_offsets=string_offsets,
+                 grams=np.array(grams, dtype=str),
+                 offsets=self.offsets,
+                 postings=self.postings)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by save"""
+        with np.load(path, allow_pickle=False) as data:
+            index = cls(int(data['q']))
+            blob = data['strings'].tobytes()
+            bounds = data['string_offsets']
+            index.strings = [blob[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(len(bounds) - 1)]
+            index.gram_ids = {str(gram): i for i, gram in enumerate(data['grams'])}
+            index.offsets = data['offsets']
+            index.postings = data['postings']
+        index.lengths = np.fromiter(map(len, index.strings), dtype=np.int32, count=len(index.strings))
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query a q-gram fuzzy search index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="Index a corpus file (one string per line)")
+    build.add_argument('corpus')
+    build.add_argument('index', help="Output index file (.npz)")
+    build.add_argument('--q', type=int, default=3, help="q-gram length (3 suits short identifiers)")
+
+    query = subparsers.add_parser('query', help="Find the closest corpus strings")
+    query.add_argument('index')
+    query.add_argument('text', nargs='+')
+    query.add_argument('--k', type=int, default=5)
+    query.add_argument('--max-distance', type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        with open(args.corpus, encoding='utf-8') as f:
+            index = QGramIndex.build((line.rstrip('\n') for line in f), q=args.q)
+        index.save(args.index)
+        print(f"✅ Indexed {len(index)} strings ({len(index.gram_ids)} q-grams) "
+              f"in {time.perf_counter() - start:.2f}s → {args.index}")
+    else:
+        index = QGramIndex.load(args.index)
+        for text in args.text:
+            start = time.perf_counter()
+            results = index.search(text, args.k, args.max_distance)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"\n🔎 '{text}' ({elapsed_ms:.2f} ms)")
+            for match, distance, similarity in results:
+                print(f"  {match:20} distance={distance}  similarity={similarity:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
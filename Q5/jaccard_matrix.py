@@ -0,0 +1,128 @@
+"""
+All-pairs Jaccard similarity on character-set bitmasks
+
+Each string's character set becomes a fixed-width bitmask (one bit per character of the
+corpus alphabet, packed into uint64 words). Intersections and unions of many pairs are then
+a vectorized AND plus popcount, computed tile by tile so memory stays bounded.
+Scores are percentages, like jaccard_similarity in string_similarity.py.
+"""
+
+import numpy as np
+
+
+def _popcount(words):
+    """Number of set bits per element of a uint64 array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    # NumPy < 2.0: byte lookup table
+    table = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+    return table[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def encode_char_sets(strings, alphabet=None):
+    """
+    Encode the character set of each string as a bitmask
+    Returns (masks, alphabet): masks is a uint64 array of shape (len(strings), words) and
+    alphabet the characters in bit order. Characters missing from a given alphabet are ignored.
+    """
+    strings = list(strings)
+    if alphabet is None:
+        alphabet = sorted(set().union(*map(set, strings))) if strings else []
+    bit_of = {char: bit for bit, char in enumerate(alphabet)}
+    words = max(1, (len(alphabet) + 63) // 64)
+
+    present = np.zeros((len(strings), words * 64), dtype=bool)
+    rows = []
+    bits = []
+    for row, text in enumerate(strings):
+        for char in set(text):
+            bit = bit_of.get(char)
+            if bit is not None:
+                rows.append(row)
+                bits.append(bit)
+    present[rows, bits] = True
+
+    masks = np.packbits(present, axis=1, bitorder='little').view('<u8').astype(np.uint64)
+    return masks, list(alphabet)
+
+
+def _tile_intersections(masks_a, masks_b):
+    """Intersection sizes for every pair of one row tile and one column tile"""
+    if masks_a.shape[1] == 1:
+        return _popcount(masks_a[:, 0][:, None] & masks_b[:, 0][None, :]).astype(np.int32)
+    return _popcount(masks_a[:, None, :] & masks_b[None, :, :]).sum(axis=2, dtype=np.int32)
+
+
+def _tile_scores(masks_a, sizes_a, masks_b, sizes_b):
+    """Jaccard percentages for every pair of one row tile and one column tile"""
+    intersection = _tile_intersections(masks_a, masks_b)
+    union = sizes_a[:, None] + sizes_b[None, :] - intersection
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(union > 0, intersection * 100.0 / union, 0.0)
+    return scores.astype(np.float32)
+
+
+def jaccard_matrix(strings_a, strings_b=None, tile=1024):
+    """
+    Dense matrix of Jaccard similarities (%) between strings_a and strings_b
+    (strings_a against itself when strings_b is None). Use jaccard_pairs_above for large inputs.
+    """
+    strings_a = list(strings_a)
+    strings_b = strings_a if strings_b is None else list(strings_b)
+    masks, alphabet = encode_char_sets(strings_a + strings_b)
+    masks_a, masks_b = masks[:len(strings_a)], masks[len(strings_a):]
+    sizes_a = _popcount(masks_a).sum(axis=1, dtype=np.int32)
+    sizes_b = _popcount(masks_b).sum(axis=1, dtype=np.int32)
+
+    result = np.zeros((len(strings_a), len(strings_b)), dtype=np.float32)
+    for i in range(0, len(strings_a), tile):
+        for j in range(0, len(strings_b), tile):
+            result[i:i + tile, j:j + tile] = _tile_scores(masks_a[i:i + tile], sizes_a[i:i + tile],
+                                                          masks_b[j:j + tile], sizes_b[j:j + tile])
+    return result
+
+
+def jaccard_pairs_above(strings, threshold, tile=1024):
+    """
+    All pairs (i, j), i < j, whose Jaccard similarity is at least threshold (%)
+    Returns (i, j, score) NumPy arrays. Strings are processed in order of set size, and
+    tiles whose size ranges cannot reach the threshold (min/max size ratio) are skipped.
+    """
+    strings = list(strings)
+    masks, _ = encode_char_sets(strings)
+    sizes = _popcount(masks).sum(axis=1, dtype=np.int32)
+
+    order = np.argsort(sizes, kind='stable')
+    masks, sizes = masks[order], sizes[order]
+    ratio = threshold / 100.0
+
+    found_i, found_j, found_score = [], [], []
+    for i in range(0, len(strings), tile):
+        rows = slice(i, i + tile)
+        largest_in_tile = sizes[rows][-1]
+        for j in range(i, len(strings), tile):
+            columns = slice(j, j + tile)
+            # J(a, b) <= |a| / |b| for |a| <= |b|: once the column sizes outgrow the rows, stop
+            if ratio > 0 and largest_in_tile < ratio * sizes[columns][0]:
+                break
+
+            # intersection / union >= ratio without dividing: 100 * |a & b| >= threshold * |a | b|
+            intersection = _tile_intersections(masks[rows], masks[columns])
+            union = sizes[rows][:, None] + sizes[columns][None, :] - intersection
+            hits = (intersection * 100.0 >= threshold * union) & (union > 0)
+            hit_rows, hit_cols = np.nonzero(hits)
+            global_rows, global_cols = hit_rows + i, hit_cols + j
+            keep = global_rows < global_cols
+            hit_rows, hit_cols = hit_rows[keep], hit_cols[keep]
+            found_i.append(order[global_rows[keep]])
+            found_j.append(order[global_cols[keep]])
+            found_score.append((intersection[hit_rows, hit_cols] * 100.0 /
+                                union[hit_rows, hit_cols]).astype(np.float32))
+
+    if not found_i:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+    first = np.concatenate(found_i)
+    second = np.concatenate(found_j)
+    # Report each pair with the smaller original index first
+    return np.minimum(first, second), np.maximum(first, second), np.concatenate(found_score)
@@ -1,3 +1,8 @@
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+
 def calculate_similarity(str1, str2):
     """
     Calculate similarity between two strings using multiple methods
@@ -53,6 +58,224 @@ def levenshtein_distance(str1, str2):
     
     return previous_row[-1]
 
+def levenshtein_within(str1, str2, k):
+    """
+    Bounded Levenshtein distance: answers "is the distance <= k?" without filling the full matrix.
+    Returns the distance if it is at most k, otherwise k + 1 (the "too far" value).
+    Only the diagonal band of width 2k+1 is computed (Ukkonen), and the scan stops as soon as
+    every cell of a row exceeds k.
+    """
+    too_far = k + 1
+    if k < 0:
+        return too_far
+
+    len1, len2 = len(str1), len(str2)
+    if abs(len1 - len2) > k:
+        return too_far
+
+    # Common prefix and suffix never cost an edit
+    start = 0
+    while start < len1 and start < len2 and str1[start] == str2[start]:
+        start += 1
+    end1, end2 = len1, len2
+    while end1 > start and end2 > start and str1[end1 - 1] == str2[end2 - 1]:
+        end1 -= 1
+        end2 -= 1
+    str1, str2 = str1[start:end1], str2[start:end2]
+    len1, len2 = len(str1), len(str2)
+
+    if len1 == 0 or len2 == 0:
+        return max(len1, len2)  # already known to be <= k
+
+    # Cells outside the band, or above k, are capped at too_far
+    previous_row = [too_far] * (len2 + 1)
+    for j in range(min(len2, k) + 1):
+        previous_row[j] = j
+    current_row = [too_far] * (len2 + 1)
+
+    for i in range(1, len1 + 1):
+        low = max(1, i - k)
+        high = min(len2, i + k)
+        current_row[low - 1] = i if low == 1 and i <= k else too_far
+        row_min = current_row[low - 1]
+
+        c1 = str1[i - 1]
+        for j in range(low, high + 1):
+            value = previous_row[j - 1] + (c1 != str2[j - 1])
+            insertion = previous_row[j] + 1
+            if insertion < value:
+                value = insertion
+            deletion = current_row[j - 1] + 1
+            if deletion < value:
+                value = deletion
+            if value > too_far:
+                value = too_far
+            current_row[j] = value
+            if value < row_min:
+                row_min = value
+
+        # The cell right of the band is read by the next row
+        if high < len2:
+            current_row[high + 1] = too_far
+
+        if row_min > k:
+            return too_far
+
+        previous_row, current_row = current_row, previous_row
+
+    return previous_row[len2]
+
+# Bit-parallel Levenshtein (Myers / Hyyro) keeps one DP column in a 64-bit word,
+# so strings up to this length use it; longer ones use the vectorized DP fallback
+BITPARALLEL_MAX_LEN = 64
+
+def _encode_strings(strings):
+    """
+    Encode strings as a padded integer matrix of code points.
+    Returns (codes, lengths); padding positions hold -1.
+    """
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    width = int(lengths.max()) if len(strings) else 0
+    codes = np.full((len(strings), max(width, 1)), -1, dtype=np.int64)
+    if width == 0:
+        return codes, lengths
+
+    flat = np.frombuffer(''.join(strings).encode('utf-32-le'), dtype=np.uint32)
+    if (lengths == width).all():
+        codes[:] = flat.reshape(len(strings), width)
+        return codes, lengths
+
+    mask = np.arange(width) < lengths[:, None]
+    codes[mask] = flat
+    return codes, lengths
+
+def _compact_alphabet(*code_arrays):
+    """Map code points (and the -1 padding) onto 0..A-1; returns (remapped arrays, A)"""
+    top = max(int(codes.max()) for codes in code_arrays) + 2
+    present = np.zeros(top, dtype=bool)
+    for codes in code_arrays:
+        present[codes.ravel() + 1] = True
+    lookup = np.cumsum(present) - 1
+    return [lookup[codes + 1] for codes in code_arrays], int(present.sum())
+
+def _levenshtein_bitparallel(pattern, pattern_len, text, text_len):
+    """
+    Myers/Hyyro bit-vector edit distance for many pairs at once.
+    pattern/text are padded code matrices with one pair per row; every pattern_len must be 1..64.
+    """
+    n_pairs = len(pattern)
+    rows = np.arange(n_pairs)
+    (pattern, text), alphabet_size = _compact_alphabet(pattern, text)
+
+    # peq[pair, char] has bit k set where pattern[k] == char
+    peq = np.zeros((n_pairs, alphabet_size), dtype=np.uint64)
+    for k in range(pattern.shape[1]):
+        active = k < pattern_len
+        peq[rows[active], pattern[active, k]] |= np.uint64(1 << k)
+    peq = peq.ravel()
+    row_base = rows * alphabet_size
+
+    one = np.uint64(1)
+    shifts = pattern_len.astype(np.uint64)
+    pv = np.where(pattern_len >= 64, ~np.uint64(0), (one << shifts) - one).astype(np.uint64)
+    mv = np.zeros(n_pairs, dtype=np.uint64)
+    high_bit = one << (shifts - one)
+    score = pattern_len.copy()
+
+    for j in range(text.shape[1]):
+        eq = peq[row_base + text[:, j]]
+
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+
+        # Columns past the end of a shorter text still update pv/mv, but never the score
+        delta = (ph & high_bit).astype(bool).view(np.int8) - (mh & high_bit).astype(bool).view(np.int8)
+        if j >= text_len.min():
+            delta *= j < text_len
+        score += delta
+
+        ph = (ph << one) | one
+        mh <<= one
+        pv = mh | ~(xv | ph)
+        mv = ph & xv
+
+    return score
+
+def _levenshtein_dp_rows(codes1, len1, codes2, len2):
+    """
+    Vectorized Wagner-Fischer DP for many (possibly long) pairs at once.
+    Each row is computed with whole-array operations: the left-neighbour dependency
+    cur[j] = min(cur[j-1] + 1, tmp[j]) is resolved as j + cumulative_min(tmp[k] - k).
+    """
+    n_pairs, width2 = codes2.shape
+    columns = np.arange(width2 + 1)
+    previous = np.broadcast_to(columns, (n_pairs, width2 + 1)).copy()
+    result = len2.copy()  # distance when str1 is empty
+
+    for i in range(1, codes1.shape[1] + 1):
+        cost = (codes1[:, i - 1:i] != codes2).astype(np.int64)
+        tmp = np.empty_like(previous)
+        tmp[:, 0] = i
+        tmp[:, 1:] = np.minimum(previous[:, 1:] + 1, previous[:, :-1] + cost)
+        current = np.minimum.accumulate(tmp - columns, axis=1) + columns
+
+        finished = len1 == i
+        result[finished] = current[finished, len2[finished]]
+        previous = current
+
+    return result
+
+def levenshtein_distance_bulk(strings1, strings2, chunk_size=16384):
+    """
+    Levenshtein distances for many pairs at once: distance(strings1[i], strings2[i]).
+    Returns a NumPy int64 array. Pairs whose shorter string has at most 64 characters use the
+    bit-parallel algorithm; the rest use a vectorized DP. Gives the same results as
+    levenshtein_distance, far faster when there are many pairs.
+    """
+    strings1 = list(strings1)
+    strings2 = list(strings2)
+    if len(strings1) != len(strings2):
+        raise ValueError("strings1 and strings2 must have the same length")
+
+    distances = np.zeros(len(strings1), dtype=np.int64)
+
+    for start in range(0, len(strings1), chunk_size):
+        chunk1 = strings1[start:start + chunk_size]
+        chunk2 = strings2[start:start + chunk_size]
+
+        codes1, len1 = _encode_strings(chunk1)
+        codes2, len2 = _encode_strings(chunk2)
+
+        # Distance is symmetric: use the shorter string of each pair as the bit-vector pattern
+        if codes1.shape[1] < codes2.shape[1]:
+            codes1 = np.pad(codes1, ((0, 0), (0, codes2.shape[1] - codes1.shape[1])), constant_values=-1)
+        elif codes2.shape[1] < codes1.shape[1]:
+            codes2 = np.pad(codes2, ((0, 0), (0, codes1.shape[1] - codes2.shape[1])), constant_values=-1)
+        swap = len1 > len2
+        short_codes = np.where(swap[:, None], codes2, codes1)
+        long_codes = np.where(swap[:, None], codes1, codes2)
+        short_len = np.minimum(len1, len2)
+        long_len = np.maximum(len1, len2)
+
+        out = distances[start:start + len(chunk1)]
+        out[:] = long_len  # covers pairs with an empty string
+
+        fast = (short_len > 0) & (short_len <= BITPARALLEL_MAX_LEN)
+        if fast.any():
+            short_width = int(short_len[fast].max())
+            long_width = int(long_len[fast].max())
+            out[fast] = _levenshtein_bitparallel(short_codes[fast, :short_width], short_len[fast],
+                                                 long_codes[fast, :long_width], long_len[fast])
+
+        slow = short_len > BITPARALLEL_MAX_LEN
+        if slow.any():
+            out[slow] = _levenshtein_dp_rows(short_codes[slow], short_len[slow],
+                                             long_codes[slow], long_len[slow])
+
+    return distances
+
 def jaccard_similarity(str1, str2):
     """
     Calculate Jaccard similarity between character sets
@@ -101,6 +324,169 @@ def align_strings(str1, str2):
     
     return best_alignment
 
+def _alignment_score_row(str1, str2, match, mismatch, gap):
+    """Last row of the Needleman-Wunsch score matrix, kept in linear memory"""
+    previous_row = [j * gap for j in range(len(str2) + 1)]
+    for i, c1 in enumerate(str1, 1):
+        current_row = [i * gap]
+        for j, c2 in enumerate(str2, 1):
+            diagonal = previous_row[j - 1] + (match if c1 == c2 else mismatch)
+            up = previous_row[j] + gap
+            left = current_row[j - 1] + gap
+            current_row.append(max(diagonal, up, left))
+        previous_row = current_row
+    return previous_row
+
+def _needleman_wunsch_full(str1, str2, match, mismatch, gap):
+    """Full-matrix Needleman-Wunsch with traceback, used on the tiny Hirschberg base cases"""
+    rows, cols = len(str1) + 1, len(str2) + 1
+    score = [[0] * cols for _ in range(rows)]
+    for i in range(rows):
+        score[i][0] = i * gap
+    for j in range(cols):
+        score[0][j] = j * gap
+    for i in range(1, rows):
+        for j in range(1, cols):
+            diagonal = score[i - 1][j - 1] + (match if str1[i - 1] == str2[j - 1] else mismatch)
+            score[i][j] = max(diagonal, score[i - 1][j] + gap, score[i][j - 1] + gap)
+
+    aligned1, aligned2 = [], []
+    i, j = len(str1), len(str2)
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and score[i][j] == score[i - 1][j - 1] + (match if str1[i - 1] == str2[j - 1] else mismatch):
+            aligned1.append(str1[i - 1])
+            aligned2.append(str2[j - 1])
+            i, j = i - 1, j - 1
+        elif i > 0 and score[i][j] == score[i - 1][j] + gap:
+            aligned1.append(str1[i - 1])
+            aligned2.append('-')
+            i -= 1
+        else:
+            aligned1.append('-')
+            aligned2.append(str2[j - 1])
+            j -= 1
+
+    return ''.join(reversed(aligned1)), ''.join(reversed(aligned2))
+
+def _hirschberg(str1, str2, match, mismatch, gap):
+    if len(str1) == 0:
+        return '-' * len(str2), str2
+    if len(str2) == 0:
+        return str1, '-' * len(str1)
+    if len(str1) == 1 or len(str2) == 1:
+        return _needleman_wunsch_full(str1, str2, match, mismatch, gap)
+
+    # Split str1 in half and find where the optimal path crosses the middle row
+    middle = len(str1) // 2
+    left_scores = _alignment_score_row(str1[:middle], str2, match, mismatch, gap)
+    right_scores = _alignment_score_row(str1[middle:][::-1], str2[::-1], match, mismatch, gap)
+    n = len(str2)
+    split = max(range(n + 1), key=lambda j: left_scores[j] + right_scores[n - j])
+
+    top1, top2 = _hirschberg(str1[:middle], str2[:split], match, mismatch, gap)
+    bottom1, bottom2 = _hirschberg(str1[middle:], str2[split:], match, mismatch, gap)
+    return top1 + bottom1, top2 + bottom2
+
+def global_align(str1, str2, match=1, mismatch=-1, gap=-1):
+    """
+    Optimal global alignment (Needleman-Wunsch) computed with Hirschberg's linear-space method.
+    Unlike align_strings it can place gaps anywhere, not only at the ends.
+    Returns the two aligned strings ('-' marks a gap), like align_strings.
+    """
+    return _hirschberg(str1, str2, match, mismatch, gap)
+
+def alignment_score(aligned1, aligned2, match=1, mismatch=-1, gap=-1):
+    """Score an alignment produced by global_align or align_strings"""
+    total = 0
+    for char1, char2 in zip(aligned1, aligned2):
+        if char1 == '-' or char2 == '-':
+            total += gap
+        else:
+            total += match if char1 == char2 else mismatch
+    return total
+
+class SimilarityCache:
+    """
+    Bounded LRU memo shared by the cached_* metric functions
+    Keys are (metric, str1, str2); for symmetric metrics the pair is put in a canonical order,
+    so "abc" vs "abd" and "abd" vs "abc" share one entry
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, metric, str1, str2, compute, symmetric=True):
+        """Return the cached value for the pair, computing and storing it on a miss"""
+        if symmetric and str2 < str1:
+            str1, str2 = str2, str1
+        key = (metric, str1, str2)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute(str1, str2)
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def resize(self, maxsize):
+        """Change the size bound, evicting least recently used entries if needed"""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) * 100 if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+similarity_cache = SimilarityCache()
+
+def cached_levenshtein_distance(str1, str2):
+    """levenshtein_distance through the shared similarity_cache"""
+    return similarity_cache.lookup('levenshtein', str1, str2, levenshtein_distance)
+
+def cached_jaccard_similarity(str1, str2):
+    """jaccard_similarity through the shared similarity_cache"""
+    return similarity_cache.lookup('jaccard', str1, str2, jaccard_similarity)
+
+def cached_calculate_similarity(str1, str2):
+    """
+    calculate_similarity through the shared similarity_cache
+    Not symmetric (EXTRA/MISSING depend on the order), so the pair order is kept;
+    the details list is copied so callers cannot modify the cached entry
+    """
+    similarity, match_details, exact_matches, max_len = similarity_cache.lookup(
+        'exact', str1, str2, calculate_similarity, symmetric=False)
+    return similarity, list(match_details), exact_matches, max_len
+
 def generate_match_report(str1, str2, similarity, match_details, method_name):
     """
     Generate a detailed match report
@@ -144,19 +530,11 @@ def generate_match_report(str1, str2, similarity, match_details, method_name):
     if missing > 0:
         print(f"➖ Missing characters: {missing}")
 
-def perform_aligned_comparison(str1, str2):
+def score_alignment(aligned_str1, aligned_str2):
     """
-    Perform comparison with alignment
+    Similarity of two aligned strings over the positions where neither has a gap
+    Returns similarity percentage, per-position details, matches and comparable positions
     """
-    print(f"\n{'🔧 ALIGNMENT ANALYSIS ':-^60}")
-    
-    # Perform alignment
-    aligned_str1, aligned_str2 = align_strings(str1, str2)
-    
-    print(f"Aligned String 1: {aligned_str1}")
-    print(f"Aligned String 2: {aligned_str2}")
-    
-    # Calculate similarity on aligned strings
     matches = 0
     total_comparable = 0
     alignment_details = []
@@ -176,12 +554,171 @@ def perform_aligned_comparison(str1, str2):
     
     aligned_similarity = (matches / total_comparable) * 100 if total_comparable > 0 else 0
     
+    return aligned_similarity, alignment_details, matches, total_comparable
+
+def perform_aligned_comparison(str1, str2, aligner=align_strings):
+    """
+    Perform comparison with alignment
+    (pass aligner=global_align for a full Needleman-Wunsch alignment instead of shift-only)
+    """
+    print(f"\n{'🔧 ALIGNMENT ANALYSIS ':-^60}")
+    
+    # Perform alignment
+    aligned_str1, aligned_str2 = aligner(str1, str2)
+    
+    print(f"Aligned String 1: {aligned_str1}")
+    print(f"Aligned String 2: {aligned_str2}")
+    
+    # Calculate similarity on aligned strings
+    aligned_similarity, alignment_details, matches, total_comparable = score_alignment(aligned_str1, aligned_str2)
+    
     print(f"Aligned Similarity: {aligned_similarity:.2f}%")
     print(f"Comparable positions: {total_comparable}")
     print(f"Matches after alignment: {matches}")
     
     return aligned_similarity, alignment_details
 
+def similarity_verdict(avg_similarity):
+    """Map an average similarity percentage to the recommendation band"""
+    if avg_similarity > 80:
+        return "VERY SIMILAR"
+    elif avg_similarity > 60:
+        return "MODERATELY SIMILAR"
+    elif avg_similarity > 40:
+        return "SOMEWHAT SIMILAR"
+    else:
+        return "NOT VERY SIMILAR"
+
+def compare_strings(str1, str2, aligner=align_strings):
+    """
+    Quiet version of analyze_strings: computes every metric and returns a flat record
+    (no printing, no per-character details) suitable for batch processing
+    """
+    exact_similarity, _, exact_matches, _ = calculate_similarity(str1, str2)
+    
+    lev_distance = levenshtein_distance(str1, str2)
+    max_len = max(len(str1), len(str2))
+    lev_similarity = ((max_len - lev_distance) / max_len) * 100 if max_len > 0 else 100.0
+    
+    jac_similarity = jaccard_similarity(str1, str2)
+    
+    if len(str1) != len(str2):
+        aligned_similarity = score_alignment(*aligner(str1, str2))[0]
+    else:
+        aligned_similarity = exact_similarity
+    
+    avg_similarity = (exact_similarity + lev_similarity + jac_similarity) / 3
+    
+    return {
+        'str1': str1,
+        'str2': str2,
+        'exact_similarity': exact_similarity,
+        'exact_matches': exact_matches,
+        'levenshtein_distance': lev_distance,
+        'levenshtein_similarity': lev_similarity,
+        'jaccard_similarity': jac_similarity,
+        'aligned_similarity': aligned_similarity,
+        'average_similarity': avg_similarity,
+        'verdict': similarity_verdict(avg_similarity),
+    }
+
+class CascadeScorer:
+    """
+    Similarity verdicts that only run the expensive metrics when cheap bounds cannot decide
+    Exact-position and Jaccard similarity are linear and always computed; the Levenshtein
+    distance is first bracketed (length difference and character histograms from below,
+    position mismatches from above). When every distance in the bracket gives the same
+    verdict band, Levenshtein and alignment are skipped.
+    Stages: 'length' (decided by length/position bounds), 'histogram' (decided after the
+    histogram bound), 'full' (bounded Levenshtein and alignment were needed)
+    """
+
+    STAGES = ('length', 'histogram', 'full')
+
+    def __init__(self, aligner=align_strings):
+        self.aligner = aligner
+        self.counts = dict.fromkeys(self.STAGES, 0)
+
+    @staticmethod
+    def _average(exact_similarity, jac_similarity, distance, max_len):
+        lev_similarity = ((max_len - distance) / max_len) * 100 if max_len > 0 else 100.0
+        return (exact_similarity + lev_similarity + jac_similarity) / 3
+
+    def _decided(self, exact_similarity, jac_similarity, lower, upper, max_len):
+        """Average similarity bounds for distances in [lower, upper], and whether they share a band"""
+        low = self._average(exact_similarity, jac_similarity, upper, max_len)
+        high = self._average(exact_similarity, jac_similarity, lower, max_len)
+        return (low, high), similarity_verdict(low) == similarity_verdict(high)
+
+    def score(self, str1, str2):
+        """
+        Record with the same keys as compare_strings plus 'stage' and 'average_bounds'
+        When a cheap stage decides, levenshtein_distance, levenshtein_similarity,
+        aligned_similarity and average_similarity are None
+        """
+        max_len = max(len(str1), len(str2))
+        exact_matches = sum(char1 == char2 for char1, char2 in zip(str1, str2))
+        exact_similarity = (exact_matches / max_len) * 100 if max_len > 0 else 0
+        jac_similarity = jaccard_similarity(str1, str2)
+
+        record = {
+            'str1': str1,
+            'str2': str2,
+            'exact_similarity': exact_similarity,
+            'exact_matches': exact_matches,
+            'levenshtein_distance': None,
+            'levenshtein_similarity': None,
+            'jaccard_similarity': jac_similarity,
+            'aligned_similarity': None,
+            'average_similarity': None,
+        }
+
+        # Stage 1: at least the length difference, at most one edit per mismatched position
+        lower = abs(len(str1) - len(str2))
+        upper = max_len - exact_matches
+        bounds, decided = self._decided(exact_similarity, jac_similarity, lower, upper, max_len)
+        stage = 'length'
+
+        if not decided:
+            # Stage 2: every surplus character must be deleted or substituted
+            counts1, counts2 = Counter(str1), Counter(str2)
+            lower = max(lower, sum((counts1 - counts2).values()), sum((counts2 - counts1).values()))
+            bounds, decided = self._decided(exact_similarity, jac_similarity, lower, upper, max_len)
+            stage = 'histogram'
+
+        if not decided:
+            stage = 'full'
+            # The distance is known to be <= upper, so the banded computation is exact
+            lev_distance = levenshtein_within(str1, str2, upper)
+            lev_similarity = ((max_len - lev_distance) / max_len) * 100 if max_len > 0 else 100.0
+            if len(str1) != len(str2):
+                aligned_similarity = score_alignment(*self.aligner(str1, str2))[0]
+            else:
+                aligned_similarity = exact_similarity
+            avg_similarity = (exact_similarity + lev_similarity + jac_similarity) / 3
+            bounds = (avg_similarity, avg_similarity)
+            record.update(levenshtein_distance=lev_distance, levenshtein_similarity=lev_similarity,
+                          aligned_similarity=aligned_similarity, average_similarity=avg_similarity)
+
+        self.counts[stage] += 1
+        record['average_bounds'] = bounds
+        record['verdict'] = similarity_verdict(bounds[0])
+        record['stage'] = stage
+        return record
+
+    def stats(self):
+        """How many pairs each stage settled, and the share that skipped Levenshtein"""
+        pairs = sum(self.counts.values())
+        short_circuited = pairs - self.counts['full']
+        return {
+            'pairs': pairs,
+            **self.counts,
+            'short_circuit_rate': (short_circuited / pairs) * 100 if pairs else 0.0,
+        }
+
+    def reset(self):
+        self.counts = dict.fromkeys(self.STAGES, 0)
+
 def analyze_strings(str1, str2):
     """
     Analyze two strings and generate comprehensive report
@@ -243,14 +780,7 @@ def analyze_strings(str1, str2):
     # Recommendation
     print(f"\n{'💡 RECOMMENDATION ':-^60}")
     avg_similarity = (similarity1 + lev_similarity + jac_similarity) / 3
-    if avg_similarity > 80:
-        print("The strings are VERY SIMILAR")
-    elif avg_similarity > 60:
-        print("The strings are MODERATELY SIMILAR")
-    elif avg_similarity > 40:
-        print("The strings are SOMEWHAT SIMILAR")
-    else:
-        print("The strings are NOT VERY SIMILAR")
+    print(f"The strings are {similarity_verdict(avg_similarity)}")
     
     return avg_similarity
 
@@ -0,0 +1,220 @@
+import argparse
+import datetime
+import gc
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import sys
+import time
+
+from test_license_plate_matching import (
+    LicensePlateGenerator,
+    calculate_similarity,
+    calculate_similarity_batch,
+    fused_similarity,
+    jaccard_similarity,
+    levenshtein_distance,
+)
+
+DEFAULT_LENGTHS = [4, 8, 16, 32, 64]
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000, 10000]
+DEFAULT_TOLERANCE = 1.5  # a median this many times the baseline's counts as a regression
+
+
+def time_calls(func, inputs, repeats=15, warmup=3):
+    """
+    Per-call time (ns) of func over the prepared inputs, one sample per repeat
+    Inputs are built beforehand, so only the calls themselves are timed; like timeit,
+    garbage collection is paused while timing
+    """
+    for _ in range(warmup):
+        for args in inputs:
+            func(*args)
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter_ns()
+            for args in inputs:
+                func(*args)
+            samples.append((time.perf_counter_ns() - start) / len(inputs))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+
+def summarize(samples):
+    """Median and interquartile range of timing samples (ns per call)"""
+    q1, median, q3 = statistics.quantiles(samples, n=4, method='inclusive')
+    return {
+        'median_ns': median,
+        'q1_ns': q1,
+        'q3_ns': q3,
+        'iqr_ns': q3 - q1,
+        'min_ns': min(samples),
+        'max_ns': max(samples),
+        'repeats': len(samples),
+    }
+
+
+def plate_pairs(count, seed=0):
+    """Valid plates paired with a one-character variant, another valid plate or an invalid plate"""
+    rng = random.Random(seed)
+    generator = LicensePlateGenerator(rng)
+    pairs = []
+    for i in range(count):
+        plate = generator.generate_valid_plate()
+        if i % 3 == 0:
+            position = rng.randrange(len(plate))
+            other = plate[:position] + rng.choice(string.ascii_uppercase + string.digits) + plate[position + 1:]
+        elif i % 3 == 1:
+            other = generator.generate_valid_plate()
+        else:
+            other = generator.generate_invalid_plate()
+        pairs.append((plate, other))
+    return pairs
+
+
+def random_pairs(count, length, seed=0):
+    rng = random.Random(seed)
+    alphabet = string.ascii_uppercase + string.digits
+    return [(''.join(rng.choices(alphabet, k=length)), ''.join(rng.choices(alphabet, k=length)))
+            for _ in range(count)]
+
+
+def run_suite(pairs=300, repeats=15, warmup=3, lengths=DEFAULT_LENGTHS, batch_sizes=DEFAULT_BATCH_SIZES, seed=0):
+    """Run every benchmark case; returns {case name: summary}"""
+    results = {}
+
+    def record(name, samples):
+        results[name] = summarize(samples)
+        stats = results[name]
+        print(f"  {name:45} median={stats['median_ns'] / 1000:9.2f} µs  IQR={stats['iqr_ns'] / 1000:8.2f} µs")
+
+    # A local generator, so the suite neither depends on nor reseeds the global random state
+    generator = LicensePlateGenerator(random.Random(seed))
+    record('generate_valid_plate', time_calls(generator.generate_valid_plate, [()] * pairs, repeats, warmup))
+    record('generate_invalid_plate', time_calls(generator.generate_invalid_plate, [()] * pairs, repeats, warmup))
+
+    inputs = plate_pairs(pairs, seed)
+    for func in (levenshtein_distance, jaccard_similarity, calculate_similarity, fused_similarity):
+        record(func.__name__, time_calls(func, inputs, repeats, warmup))
+
+    # Scaling with string length: the DP metrics grow quadratically
+    for length in lengths:
+        inputs = random_pairs(max(pairs // max(length // 8, 1), 10), length, seed)
+        for func in (levenshtein_distance, calculate_similarity):
+            record(f"length/{func.__name__}/{length}", time_calls(func, inputs, repeats, warmup))
+
+    # Scaling with batch size: per-pair cost of one call over a batch of pairs
+    has_numpy = importlib.util.find_spec('numpy') is not None
+    for size in batch_sizes:
+        batch = plate_pairs(size, seed)
+        plates1 = [plate for plate, _ in batch]
+        plates2 = [other for _, other in batch]
+        batch_repeats = max(min(repeats, 100000 // size), 5)
+
+        loop = lambda: [calculate_similarity(a, b) for a, b in batch]
+        samples = [sample / size for sample in time_calls(loop, [()], batch_repeats, warmup)]
+        record(f"batch/calculate_similarity_loop/{size}", samples)
+
+        if has_numpy:
+            vectorized = lambda: calculate_similarity_batch(plates1, plates2)
+            samples = [sample / size for sample in time_calls(vectorized, [()], batch_repeats, warmup)]
+            record(f"batch/calculate_similarity_batch/{size}", samples)
+
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Cases that got slower than the baseline
+    A case regresses when its median exceeds tolerance x the baseline median and its
+    interquartile range no longer overlaps the baseline's (so noise alone does not trigger it)
+    Returns [(name, baseline median ns, current median ns)]
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        slower = current['median_ns'] > tolerance * previous['median_ns']
+        separated = current['q1_ns'] > previous['q3_ns']
+        if slower and separated:
+            regressions.append((name, previous['median_ns'], current['median_ns']))
+    return regressions
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def save_results(path, results, settings):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'settings': settings,
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark plate generation and similarity functions")
+    parser.add_argument('--pairs', type=int, default=300, help="Inputs per timed repeat")
+    parser.add_argument('--repeats', type=int, default=15, help="Timed repeats per case")
+    parser.add_argument('--warmup', type=int, default=3, help="Untimed passes before timing")
+    parser.add_argument('--lengths', nargs='+', type=int, default=DEFAULT_LENGTHS)
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=DEFAULT_BATCH_SIZES)
+    parser.add_argument('--output', default=None, help="JSON results file (default: benchmarks/plates_<timestamp>.json)")
+    parser.add_argument('--save-baseline', metavar='PATH', help="Also write the results as a baseline file")
+    parser.add_argument('--baseline', metavar='PATH', help="Compare against a baseline; exit 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Slowdown factor that counts as a regression")
+    args = parser.parse_args()
+
+    settings = {'pairs': args.pairs, 'repeats': args.repeats, 'warmup': args.warmup,
+                'lengths': args.lengths, 'batch_sizes': args.batch_sizes}
+    print(f"⏱️  {args.repeats} repeats x {args.pairs} inputs (warmup {args.warmup})")
+    results = run_suite(args.pairs, args.repeats, args.warmup, args.lengths, args.batch_sizes)
+
+    output = args.output
+    if output is None:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join('benchmarks', f"plates_{timestamp}.json")
+    save_results(output, results, settings)
+    print(f"\n📄 Benchmark results saved: {output}")
+
+    if args.save_baseline:
+        save_results(args.save_baseline, results, settings)
+        print(f"📌 Baseline saved: {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, load_results(args.baseline), args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for name, before, after in regressions:
+                print(f"  {name:45} {before / 1000:9.2f} µs → {after / 1000:9.2f} µs ({after / before:.2f}x)")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.baseline} (tolerance {args.tolerance}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Threshold evaluation for plate matching on tens of millions of generated pairs.
+
+Matching pairs are valid plates against a noisy copy (PlateNoiseModel); non-matching pairs
+are valid plates against an invalid plate (as in test_invalid_plate_matching) or against
+another valid plate. Chunks of pairs are generated and scored in a process pool, and only
+fixed-size similarity histograms plus a bounded reservoir of failure examples come back,
+so memory stays the same whatever the number of pairs. ROC / precision-recall curves and
+the best thresholds are computed from the histograms.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from test_license_plate_matching import LicensePlateGenerator, PlateNoiseModel, calculate_similarity_batch
+
+MATCH_THRESHOLD = 0.7    # matching pairs should score at least this
+REJECT_THRESHOLD = 0.5   # non-matching pairs should score below this
+DEFAULT_BINS = 1000
+DEFAULT_CHUNK_SIZE = 50000
+DEFAULT_RESERVOIR = 100
+
+
+class ThresholdStats:
+    """
+    Mergeable summary of scored pairs: one histogram per class and a reservoir of failures.
+
+    Failures are kept by random priority (the `reservoir` smallest keys win), so merging
+    two summaries gives the same uniform sample as scoring everything in one place.
+    """
+
+    def __init__(self, bins=DEFAULT_BINS, reservoir=DEFAULT_RESERVOIR):
+        self.bins = bins
+        self.reservoir = reservoir
+        self.matching = np.zeros(bins, dtype=np.int64)
+        self.non_matching = np.zeros(bins, dtype=np.int64)
+        self.failures = {'matching': 0, 'non_matching': 0}
+        self.samples = []  # heap of (-priority, kind, plate1, plate2, similarity)
+
+    def _bin(self, similarities):
+        # The epsilon keeps scores sitting exactly on a bin edge (e.g. 0.7) in the upper bin
+        return np.clip((similarities * self.bins + 1e-9).astype(np.int64), 0, self.bins - 1)
+
+    def add(self, kind, plates1, plates2, similarities, failed, rng):
+        """Count one class of pairs; failed marks the pairs to consider for the reservoir."""
+        histogram = self.matching if kind == 'matching' else self.non_matching
+        histogram += np.bincount(self._bin(similarities), minlength=self.bins)
+
+        rows = np.flatnonzero(failed)
+        self.failures[kind] += len(rows)
+        if not len(rows) or not self.reservoir:
+            return
+        priorities = rng.random(len(rows))
+        # Only the reservoir-smallest priorities of this batch can make it into the sample
+        if len(rows) > self.reservoir:
+            best = np.argpartition(priorities, self.reservoir)[:self.reservoir]
+            rows, priorities = rows[best], priorities[best]
+        for row, priority in zip(rows.tolist(), priorities.tolist()):
+            self._offer((priority, kind, plates1[row], plates2[row], float(similarities[row])))
+
+    def _offer(self, sample):
+        priority, *rest = sample
+        entry = (-priority, *rest)
+        if len(self.samples) < self.reservoir:
+            heapq.heappush(self.samples, entry)
+        elif entry > self.samples[0]:
+            heapq.heapreplace(self.samples, entry)
+
+    def merge(self, other):
+        self.matching += other.matching
+        self.non_matching += other.non_matching
+        for kind, count in other.failures.items():
+            self.failures[kind] += count
+        for negative_priority, *rest in other.samples:
+            self._offer((-negative_priority, *rest))
+        return self
+
+    def failure_samples(self):
+        """Sampled failures as dicts, lowest priority first (a stable order for reports)."""
+        return [{'kind': kind, 'plate1': plate1, 'plate2': plate2, 'similarity': similarity}
+                for _, kind, plate1, plate2, similarity in sorted(self.samples, reverse=True)]
+
+
+def _evaluate_chunk(index, size, seed, noise, negatives, bins, reservoir):
+    """Worker: generate and score one chunk of pairs (runs in a separate process)."""
+    generator = LicensePlateGenerator()
+    rng = np.random.default_rng([seed, index])
+    stats = ThresholdStats(bins, reservoir)
+
+    clean, noisy = generator.generate_noisy_pairs(size, seed=[seed, index, 0], noise=noise)
+    similarities = calculate_similarity_batch(clean, noisy)
+    stats.add('matching', clean, noisy, similarities, similarities < MATCH_THRESHOLD, rng)
+
+    plates = generator.generate_bulk(size, 'valid', seed=[seed, index, 1])
+    others = generator.generate_bulk(size, negatives, seed=[seed, index, 2])
+    similarities = calculate_similarity_batch(plates, others)
+    stats.add('non_matching', plates, others, similarities, similarities >= REJECT_THRESHOLD, rng)
+    return stats
+
+
+def evaluate_thresholds(pairs, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, seed=0, noise=None,
+                        negatives='invalid', bins=DEFAULT_BINS, reservoir=DEFAULT_RESERVOIR,
+                        max_pending=None, progress=None):
+    """
+    Score `pairs` matching and `pairs` non-matching pairs and return the merged ThresholdStats.
+    Results depend only on seed and chunk_size, not on the number of workers; at most
+    max_pending chunks (default 2 per worker) are in flight. workers=0 runs in this process.
+    """
+    if negatives not in ('invalid', 'valid'):
+        raise ValueError(f"Unknown negatives: {negatives!r} (expected 'invalid' or 'valid')")
+
+    noise = noise or PlateNoiseModel()
+    chunks = [(index, min(chunk_size, pairs - start))
+              for index, start in enumerate(range(0, pairs, chunk_size))]
+    total = ThresholdStats(bins, reservoir)
+    done = 0
+
+    def collect(stats, size):
+        nonlocal done
+        total.merge(stats)
+        done += size
+        if progress:
+            progress(done, pairs)
+
+    if workers == 0:
+        for index, size in chunks:
+            collect(_evaluate_chunk(index, size, seed, noise, negatives, bins, reservoir), size)
+        return total
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for index, size in chunks:
+            pending.append((executor.submit(_evaluate_chunk, index, size, seed, noise, negatives,
+                                            bins, reservoir), size))
+            if len(pending) >= max_pending:
+                future, size = pending.popleft()
+                collect(future.result(), size)
+        while pending:
+            future, size = pending.popleft()
+            collect(future.result(), size)
+    return total
+
+
+def threshold_curves(stats):
+    """
+    ROC and precision-recall points for every bin edge t (a pair is a match when similarity >= t).
+    Returns a dict of NumPy arrays: threshold, tpr, fpr, precision, recall, f1.
+    """
+    # Pairs scoring at least each bin edge: reversed cumulative sums
+    true_positives = np.cumsum(stats.matching[::-1])[::-1]
+    false_positives = np.cumsum(stats.non_matching[::-1])[::-1]
+    positives = max(int(stats.matching.sum()), 1)
+    negatives = max(int(stats.non_matching.sum()), 1)
+
+    tpr = true_positives / positives
+    fpr = false_positives / negatives
+    predicted = true_positives + false_positives
+    precision = np.divide(true_positives, predicted, out=np.ones(stats.bins), where=predicted > 0)
+    f1 = np.divide(2 * precision * tpr, precision + tpr, out=np.zeros(stats.bins),
+                   where=(precision + tpr) > 0)
+    return {'threshold': np.arange(stats.bins) / stats.bins, 'tpr': tpr, 'fpr': fpr,
+            'precision': precision, 'recall': tpr, 'f1': f1}
+
+
+def _at(curves, index):
+    return {name: float(values[index]) for name, values in curves.items()}
+
+
+def summarize_thresholds(stats):
+    """Best thresholds (max F1, max Youden's J), ROC AUC and the metrics at the current thresholds."""
+    curves = threshold_curves(stats)
+    # Trapezoidal AUC over the ROC points, from (0, 0) up to the lowest threshold
+    fpr = np.concatenate(([0.0], curves['fpr'][::-1]))
+    tpr = np.concatenate(([0.0], curves['tpr'][::-1]))
+    edge = lambda value: min(int(round(value * stats.bins)), stats.bins - 1)
+    return {
+        'pairs': {'matching': int(stats.matching.sum()), 'non_matching': int(stats.non_matching.sum())},
+        'roc_auc': float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2)),
+        'best_f1': _at(curves, int(np.argmax(curves['f1']))),
+        'best_youden': _at(curves, int(np.argmax(curves['tpr'] - curves['fpr']))),
+        'at_match_threshold': _at(curves, edge(MATCH_THRESHOLD)),
+        'at_reject_threshold': _at(curves, edge(REJECT_THRESHOLD)),
+        'failures': dict(stats.failures),
+    }
+
+
+def save_report(path, stats, settings):
+    """JSON report: settings, summary, histograms, curves and sampled failures."""
+    curves = threshold_curves(stats)
+    report = {
+        'settings': settings,
+        'summary': summarize_thresholds(stats),
+        'histograms': {'matching': stats.matching.tolist(), 'non_matching': stats.non_matching.tolist()},
+        'curves': {name: values.round(6).tolist() for name, values in curves.items()},
+        'failure_samples': stats.failure_samples(),
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate plate matching thresholds on generated pairs")
+    parser.add_argument('--pairs', type=int, default=1000000, help="Matching pairs (and as many non-matching pairs)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Pairs per worker task")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (0: run in this process)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--negatives', choices=['invalid', 'valid'], default='invalid',
+                        help="Pair valid plates with invalid plates or with other valid plates")
+    parser.add_argument('--substitution', type=float, default=0.02, help="Noise: random substitution rate")
+    parser.add_argument('--confusion', type=float, default=0.05, help="Noise: OCR confusion rate")
+    parser.add_argument('--insertion', type=float, default=0.01, help="Noise: insertion rate")
+    parser.add_argument('--deletion', type=float, default=0.01, help="Noise: deletion rate")
+    parser.add_argument('--bins', type=int, default=DEFAULT_BINS, help="Histogram bins over [0, 1]")
+    parser.add_argument('--reservoir', type=int, default=DEFAULT_RESERVOIR, help="Failure examples to keep")
+    parser.add_argument('--output', default='threshold_report.json', help="JSON report path")
+    args = parser.parse_args()
+
+    noise = PlateNoiseModel(substitution=args.substitution, insertion=args.insertion,
+                            deletion=args.deletion, confusion=args.confusion)
+    start = time.perf_counter()
+
+    def progress(done, total):
+        rate = done / max(time.perf_counter() - start, 1e-9)
+        print(f"\r  {done:,}/{total:,} pairs ({rate:,.0f} pairs/s)", end='', file=sys.stderr)
+
+    stats = evaluate_thresholds(args.pairs, args.chunk_size, args.workers, args.seed, noise,
+                                args.negatives, args.bins, args.reservoir, progress=progress)
+    print(file=sys.stderr)
+
+    settings = {name: value for name, value in vars(args).items() if name != 'output'}
+    save_report(args.output, stats, settings)
+    summary = summarize_thresholds(stats)
+
+    print(f"✅ {summary['pairs']['matching']:,} matching + {summary['pairs']['non_matching']:,} "
+          f"non-matching pairs in {time.perf_counter() - start:.1f}s → {args.output}")
+    print(f"ROC AUC: {summary['roc_auc']:.4f}")
+    for label, key in (("Best F1", 'best_f1'), ("Best Youden's J", 'best_youden'),
+                       (f"At {MATCH_THRESHOLD}", 'at_match_threshold'),
+                       (f"At {REJECT_THRESHOLD}", 'at_reject_threshold')):
+        point = summary[key]
+        print(f"  {label:16} threshold={point['threshold']:.3f}  TPR={point['tpr']:.4f}  "
+              f"FPR={point['fpr']:.4f}  precision={point['precision']:.4f}  F1={point['f1']:.4f}")
+    print(f"Failures: {summary['failures']['matching']:,} matching pairs < {MATCH_THRESHOLD}, "
+          f"{summary['failures']['non_matching']:,} non-matching pairs >= {REJECT_THRESHOLD}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Validation and normalization of OCR'd Indian license plates.
+
+Plates are canonicalized (uppercase, spaces/hyphens/dots removed) and matched against a
+table of formats; in letter positions a confusable digit is read as its letter (0 -> O,
+8 -> B, ...) and in digit positions the other way round, except next to the number block
+where a digit is as likely an extra digit. Junk such as generate_invalid_plate output is
+rejected before it reaches the similarity functions.
+
+Single plates go through one compiled regex built from the tables; normalize_bulk runs the
+same tables as NumPy lookups over whole arrays of plates.
+"""
+
+import re
+
+try:
+    import numpy as np
+except ImportError:  # optional: only normalize_bulk needs it
+    np = None
+
+from plate_hotlist import OCR_CONFUSION_PAIRS
+
+# State and union territory codes (BH: Bharat series, see PLATE_FORMATS)
+STATE_CODES = [
+    'AN', 'AP', 'AR', 'AS', 'BR', 'CG', 'CH', 'DD', 'DL', 'DN', 'GA', 'GJ', 'HP', 'HR', 'JH',
+    'JK', 'KA', 'KL', 'LA', 'LD', 'MH', 'ML', 'MN', 'MP', 'MZ', 'NL', 'OD', 'OR', 'PB', 'PY',
+    'RJ', 'SK', 'TN', 'TR', 'TS', 'UK', 'UP', 'WB',
+]
+
+# (name, pattern) tried in order: S = state code letter, L = letter, D = digit,
+# anything else must appear literally
+PLATE_FORMATS = [
+    ('standard', 'SSDDLLDDDD'),        # MH12AB1234
+    ('single_series', 'SSDDLDDDD'),    # MH12A1234
+    ('triple_series', 'SSDDLLLDDDD'),  # MH12ABC1234
+    ('short_district', 'SSDLLLDDDD'),  # DL3CAB1234
+    ('no_series', 'SSDDDDDD'),         # MH121234
+    ('bharat', 'DDBHDDDDLL'),          # 22BH1234AB
+]
+
+SEPARATORS = ' -.'
+MAX_PLATE_LENGTH = 16  # longer inputs (once separators are removed) are rejected without matching
+
+_strip_separators = str.maketrans('', '', SEPARATORS)
+
+
+class PlateFormatValidator:
+    """
+    Table-driven plate validator.
+
+    normalize() returns the canonical plate or None. A plate that matches a format exactly
+    always wins over one that only matches after fixing letter/digit confusions, and formats
+    are tried in table order. state_codes=None accepts any two letters as the state code
+    (LicensePlateGenerator uses random letters).
+    """
+
+    def __init__(self, formats=PLATE_FORMATS, state_codes=STATE_CODES, fix_confusions=True,
+                 confusion_pairs=OCR_CONFUSION_PAIRS):
+        self.formats = list(formats)
+        self.state_codes = None if state_codes is None else sorted(set(state_codes))
+        self.fix_confusions = fix_confusions
+
+        # Which characters each slot accepts, and what each accepted character becomes
+        letters = {chr(c): chr(c) for c in range(ord('A'), ord('Z') + 1)}
+        digits = {str(d): str(d) for d in range(10)}
+        self._as_letter = dict(letters)
+        self._as_digit = dict(digits)
+        if fix_confusions:
+            for first, second in confusion_pairs:
+                digit, letter = (first, second) if first.isdigit() else (second, first)
+                self._as_letter.setdefault(digit, letter)
+                self._as_digit.setdefault(letter, digit)
+        self._exact = {'L': letters, 'D': digits, 'S': letters}
+        self._lenient = {'L': self._as_letter, 'D': self._as_digit, 'S': self._as_letter}
+        self._exact_slots = [self._slot_maps(pattern, self._exact) for _, pattern in self.formats]
+        self._lenient_slots = [self._slot_maps(pattern, self._lenient) for _, pattern in self.formats]
+
+        self._clean_table = {ord(c): None for c in SEPARATORS}
+        self._clean_table.update({ord(c): c.upper() for c in 'abcdefghijklmnopqrstuvwxyz'})
+
+        self._strict = re.compile(self._alternation(self._exact_slots))
+        self._relaxed = re.compile(self._alternation(self._lenient_slots)) if fix_confusions else None
+        self._translations = [[(position, str.maketrans(slot)) for position, slot in enumerate(slots)]
+                              for slots in self._lenient_slots]
+        self._bulk_tables = None
+
+    # ---------------- REGEX ---------------- #
+
+    def _slot_maps(self, pattern, accepted):
+        """
+        {accepted char: what it becomes} for each position of a pattern.
+        Letter slots next to the number block (the last run of digits) only take letters:
+        a digit there is as likely an extra digit as a misread letter (MH12AB12345).
+        """
+        end = pattern.rindex('D') + 1 if 'D' in pattern else 0
+        start = end
+        while start > 0 and pattern[start - 1] == 'D':
+            start -= 1
+        neighbours = {start - 1, end} if end else set()
+        return [self._exact[kind] if position in neighbours and kind in self._exact
+                else accepted.get(kind, {kind: kind})
+                for position, kind in enumerate(pattern)]
+
+    def _slot_regex(self, slot):
+        return '[' + ''.join(re.escape(char) for char in sorted(slot)) + ']'
+
+    def _state_regex(self, first, second):
+        if self.state_codes is None:
+            return self._slot_regex(first) + self._slot_regex(second)
+        # Each state code, with every character a letter slot would read as its letters
+        codes = []
+        for a, b in self.state_codes:
+            readers = [[char for char, letter in slot.items() if letter == target]
+                       for slot, target in ((first, a), (second, b))]
+            codes.append(''.join('[' + ''.join(sorted(chars)) + ']' for chars in readers))
+        return '(?:' + '|'.join(codes) + ')'
+
+    def _alternation(self, slot_maps):
+        branches = []
+        for index, ((_, pattern), slots) in enumerate(zip(self.formats, slot_maps)):
+            body = []
+            position = 0
+            while position < len(pattern):
+                if pattern.startswith('SS', position):
+                    body.append(self._state_regex(slots[position], slots[position + 1]))
+                    position += 2
+                else:
+                    body.append(self._slot_regex(slots[position]))
+                    position += 1
+            branches.append(f"(?P<f{index}>{''.join(body)})")
+        return '|'.join(branches)
+
+    # ---------------- SINGLE PLATES ---------------- #
+
+    def clean(self, text):
+        """Uppercase ASCII letters and drop spaces, hyphens and dots."""
+        return text.translate(self._clean_table)
+
+    def match(self, text):
+        """(format name, canonical plate) or None."""
+        text = text.translate(self._clean_table)
+        if len(text) > MAX_PLATE_LENGTH:
+            return None
+        found = self._strict.fullmatch(text)
+        if found is None and self._relaxed is not None:
+            found = self._relaxed.fullmatch(text)
+        if found is None:
+            return None
+        index = int(found.lastgroup[1:])
+        plate = ''.join(text[position].translate(table) for position, table in self._translations[index])
+        return self.formats[index][0], plate
+
+    def normalize(self, text):
+        """Canonical plate, or None if text is not a plate in any known format."""
+        found = self.match(text)
+        return None if found is None else found[1]
+
+    def is_valid(self, text):
+        return self.match(text) is not None
+
+    # ---------------- BULK (NumPy) ---------------- #
+
+    def _build_bulk_tables(self):
+        clean = np.arange(256, dtype=np.uint8)
+        clean[ord('a'):ord('z') + 1] -= 32
+        clean[[ord(c) for c in SEPARATORS]] = 0
+
+        state_ok = np.zeros(1 << 16, dtype=bool)
+        if self.state_codes is None:
+            for a in range(ord('A'), ord('Z') + 1):
+                state_ok[(a << 8) + ord('A'):(a << 8) + ord('Z') + 1] = True
+        else:
+            state_ok[[(ord(a) << 8) | ord(b) for a, b in self.state_codes]] = True
+
+        passes = []
+        for slot_maps in ([self._exact_slots, self._lenient_slots] if self.fix_confusions else [self._exact_slots]):
+            tables = []
+            for index, ((_, pattern), slots) in enumerate(zip(self.formats, slot_maps)):
+                # output[position, byte]: what the byte becomes in that position, 0 if rejected
+                output = np.zeros((len(pattern), 256), dtype=np.uint8)
+                for position, slot in enumerate(slots):
+                    for char, target in slot.items():
+                        output[position, ord(char)] = ord(target)
+                state = pattern.index('SS') if 'SS' in pattern else None
+                tables.append((index, output, state))
+            passes.append(tables)
+        return clean, state_ok, passes
+
+    def normalize_bulk(self, plates):
+        """
+        normalize() over many plates at once with NumPy.
+
+        plates: a list of str (returns a list of canonical plates / None), or an (n, width)
+        uint8 array of zero-padded ASCII rows such as generate_bulk(out=...) fills, in which
+        case (codes, formats) arrays are returned: canonical zero-padded rows and the index
+        into self.formats of each plate (-1 where rejected).
+        """
+        if np is None:
+            raise ImportError("normalize_bulk needs NumPy (pip install numpy)")
+        if self._bulk_tables is None:
+            self._bulk_tables = self._build_bulk_tables()
+        clean, state_ok, passes = self._bulk_tables
+
+        as_strings = not isinstance(plates, np.ndarray)
+        codes = _encode_ascii(plates) if as_strings else plates
+        n, width = codes.shape
+
+        # Clean, then left-align the rows that had separators (or gaps) removed
+        cleaned = clean[codes]
+        keep = cleaned != 0
+        lengths = keep.sum(axis=1)
+        gapped = np.flatnonzero((keep[:, 1:] & ~keep[:, :-1]).any(axis=1))
+        if len(gapped):
+            rows = cleaned[gapped]
+            order = np.argsort(rows == 0, axis=1, kind='stable')
+            cleaned[gapped] = np.take_along_axis(rows, order, axis=1)
+
+        width_out = max(len(pattern) for _, pattern in self.formats)
+        result = np.zeros((n, width_out), dtype=np.uint8)
+        formats = np.full(n, -1, dtype=np.int64)
+        for tables in passes:
+            for index, output, state in tables:
+                size = output.shape[0]
+                candidates = np.flatnonzero((formats < 0) & (lengths == size))
+                if not len(candidates) or size > width:
+                    continue
+                # One row per position, so each lookup is a contiguous take
+                chars = cleaned[candidates, :size].T.copy()
+                mapped = np.empty_like(chars)
+                for position in range(size):
+                    np.take(output[position], chars[position], out=mapped[position])
+                ok = (mapped != 0).all(axis=0)
+                if state is not None:
+                    ok &= state_ok[(mapped[state].astype(np.int64) << 8) | mapped[state + 1]]
+                hits = candidates[ok]
+                result[hits, :size] = mapped[:, ok].T
+                formats[hits] = index
+
+        if not as_strings:
+            return result, formats
+        decoded = result.view(f'S{width_out}').ravel().astype(f'U{width_out}').tolist()
+        return [plate if found >= 0 else None for plate, found in zip(decoded, formats.tolist())]
+
+
+def _encode_ascii(plates):
+    """List of str -> zero-padded (n, width) uint8 rows; overlong or non-ASCII plates become invalid rows."""
+    # Length is judged without separators, as in match(); only long inputs need stripping here
+    plates = [plate if len(plate) <= MAX_PLATE_LENGTH else plate.translate(_strip_separators) for plate in plates]
+    plates = [plate if len(plate) <= MAX_PLATE_LENGTH else '\x01' for plate in plates]
+    width = max(max(map(len, plates), default=0), 1)
+    points = np.array(plates, dtype=f'U{width}').view(np.uint32).reshape(len(plates), width)
+    # Any non-ASCII character becomes a byte no format accepts
+    return np.where(points < 128, points, 1).astype(np.uint8)
@@ -0,0 +1,263 @@
+"""
+Real-time matching of OCR'd plates against a hotlist of flagged plates.
+"""
+
+from itertools import combinations
+
+# Substitutions OCR engines commonly make on plates; they cost less than other edits
+OCR_CONFUSION_PAIRS = [('0', 'O'), ('1', 'I'), ('8', 'B'), ('5', 'S'), ('2', 'Z'), ('6', 'G')]
+
+
+class PlateHotlist:
+    """
+    Hotlist of flagged plates with bounded-distance lookups.
+
+    Distance is an edit distance where an OCR confusion (0/O, 1/I, ...) costs confusion_cost
+    and any other substitution, insertion or deletion costs 1.
+
+    Plates are indexed with confusable characters folded together (O -> 0, I -> 1, ...), so
+    confusions never change a key. A plate within max_cost has at most k = floor(max_cost)
+    other edits, and each edit changes at most one piece of the plate. Split into 2k + 1
+    pieces, at least k + 1 of them are then unchanged (pigeonhole), so every combination of
+    k + 1 pieces is a key: together they cover more than half of the plate, which keeps
+    buckets small even for k = 2 and real state codes. The insertions and deletions bound how
+    far each unchanged piece can have moved in the query, so a lookup probes a bounded set of
+    keys (17 for k = 1, about 130 for k = 2 when all plates have the query's length) and
+    verifies only the few dozen plates found there, most of them rejected by a bit-parallel
+    edit distance before the weighted one is computed.
+    """
+
+    def __init__(self, plates=(), max_cost=1.0, confusion_cost=0.5, confusion_pairs=OCR_CONFUSION_PAIRS):
+        self.max_cost = max_cost
+        self.confusion_cost = confusion_cost
+        self.max_edits = int(max_cost)
+        self._piece_count = 2 * self.max_edits + 1
+        self._combinations = list(combinations(range(self._piece_count), self.max_edits + 1))
+
+        self._fold = {}
+        self._confusable = set()
+        for first, second in confusion_pairs:
+            canonical = self._fold.get(first) or self._fold.get(second) or first
+            self._fold[first] = self._fold[second] = canonical
+            self._confusable.add((first, second))
+            self._confusable.add((second, first))
+        self._fold_table = str.maketrans(self._fold)
+
+        self._plates = []    # entry id -> plate (None once removed)
+        self._ids = {}       # plate -> entry id
+        self._free = []      # ids of removed entries, reused by add
+        self._tables = {}    # (plate length, combination) -> {pieces: entry id, or [entry ids] if several}
+        self._layouts = {}   # plate length -> [(start, size) of each piece] per combination
+        self._shift_cache = {}
+        self._probe_cache = {}
+
+        for plate in plates:
+            self.add(plate)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, plate):
+        return plate.upper() in self._ids
+
+    def _layout(self, length):
+        """(start, size) of the pieces in each combination, for a plate of this length"""
+        layout = self._layouts.get(length)
+        if layout is None:
+            count = self._piece_count
+            bounds = [length * i // count for i in range(count + 1)]
+            layout = [[(bounds[i], bounds[i + 1] - bounds[i]) for i in combination]
+                      for combination in self._combinations]
+            self._layouts[length] = layout
+        return layout
+
+    def _keys(self, folded):
+        length = len(folded)
+        return [((length, index), ''.join(folded[start:start + size] for start, size in spans))
+                for index, spans in enumerate(self._layout(length))]
+
+    def _shifts(self, length_change):
+        """
+        Offsets of a combination's pieces in a query that is length_change characters longer.
+        A piece's offset is the net number of insertions before it, so the changes in offset
+        between consecutive pieces, and from the last piece to length_change, each need at
+        least that many insertions or deletions; together they are at most max_edits.
+        """
+        shifts = self._shift_cache.get(length_change)
+        if shifts is None:
+            edits = self.max_edits
+            shifts = [((), 0, 0)]  # (offsets so far, last offset, indels so far)
+            for _ in range(self.max_edits + 1):
+                shifts = [(vector + (offset,), offset, indels + abs(offset - last))
+                          for vector, last, indels in shifts
+                          for offset in range(-edits, edits + 1)
+                          if indels + abs(offset - last) <= edits]
+            shifts = [vector for vector, last, indels in shifts if indels + abs(length_change - last) <= edits]
+            self._shift_cache[length_change] = shifts
+        return shifts
+
+    def _probes(self, query_length):
+        """[(table key, [(start, end) of each piece in the query, per possible shift])] for a query length"""
+        probes = self._probe_cache.get(query_length)
+        if probes is None:
+            probes = []
+            edits = self.max_edits
+            for length in range(max(query_length - edits, 0), query_length + edits + 1):
+                shifts = self._shifts(query_length - length)
+                for index, spans in enumerate(self._layout(length)):
+                    placed = [tuple((start + shift, start + shift + size) for (start, size), shift in zip(spans, vector))
+                              for vector in shifts]
+                    placed = [spans for spans in placed
+                              if all(start >= 0 and end <= query_length for start, end in spans)]
+                    if placed:
+                        probes.append(((length, index), placed))
+            self._probe_cache[query_length] = probes
+        return probes
+
+    def add(self, plate):
+        """Add a plate; returns False if it was already on the hotlist."""
+        plate = plate.upper()
+        if plate in self._ids:
+            return False
+
+        entry = self._free.pop() if self._free else len(self._plates)
+        if entry == len(self._plates):
+            self._plates.append(plate)
+        else:
+            self._plates[entry] = plate
+        self._ids[plate] = entry
+
+        for table_key, pieces in self._keys(plate.translate(self._fold_table)):
+            table = self._tables.setdefault(table_key, {})
+            bucket = table.get(pieces)
+            if bucket is None:
+                table[pieces] = entry
+            elif isinstance(bucket, list):
+                bucket.append(entry)
+            else:
+                table[pieces] = [bucket, entry]
+        return True
+
+    def remove(self, plate):
+        """Remove a plate; returns False if it was not on the hotlist."""
+        plate = plate.upper()
+        entry = self._ids.pop(plate, None)
+        if entry is None:
+            return False
+
+        for table_key, pieces in self._keys(plate.translate(self._fold_table)):
+            table = self._tables[table_key]
+            bucket = table[pieces]
+            if isinstance(bucket, list):
+                bucket.remove(entry)
+                if len(bucket) == 1:
+                    table[pieces] = bucket[0]
+            else:
+                del table[pieces]
+        self._plates[entry] = None
+        self._free.append(entry)
+        return True
+
+    def distance(self, plate1, plate2, limit=None):
+        """
+        OCR-weighted edit distance between two (uppercase) plates.
+        With limit, stops early and returns a value > limit once the distance must exceed it.
+        """
+        if len(plate1) < len(plate2):
+            plate1, plate2 = plate2, plate1
+        if limit is not None and len(plate1) - len(plate2) > limit:
+            return len(plate1) - len(plate2)
+
+        confusable = self._confusable
+        confusion_cost = self.confusion_cost
+        # Cells more than `band` off the diagonal need more than `limit` insertions/deletions
+        band = len(plate1) if limit is None else int(limit)
+        out_of_band = float('inf')
+        previous_row = [j if j <= band else out_of_band for j in range(len(plate2) + 1)]
+        for i, char1 in enumerate(plate1, 1):
+            current_row = [i if i <= band else out_of_band] + [out_of_band] * len(plate2)
+            for j in range(max(i - band, 1), min(i + band, len(plate2)) + 1):
+                char2 = plate2[j - 1]
+                if char1 == char2:
+                    cost = previous_row[j - 1]
+                elif (char1, char2) in confusable:
+                    cost = previous_row[j - 1] + confusion_cost
+                else:
+                    cost = previous_row[j - 1] + 1
+                if previous_row[j] + 1 < cost:
+                    cost = previous_row[j] + 1
+                if current_row[j - 1] + 1 < cost:
+                    cost = current_row[j - 1] + 1
+                current_row[j] = cost
+            if limit is not None and min(current_row) > limit:
+                return min(current_row)
+            previous_row = current_row
+        return previous_row[-1]
+
+    def lookup(self, plate, max_cost=None):
+        """All hotlist plates within max_cost (default: the index bound) of plate, as [(plate, cost)] sorted by cost."""
+        max_cost = self.max_cost if max_cost is None else max_cost
+        if max_cost > self.max_cost:
+            raise ValueError(f"This hotlist was built for max_cost <= {self.max_cost}")
+
+        query = plate.upper()
+        folded = query.translate(self._fold_table)
+        tables = self._tables
+
+        candidates = set()
+        for table_key, probes in self._probes(len(folded)):
+            table = tables.get(table_key)
+            if not table:
+                continue
+            for spans in probes:
+                bucket = table.get(''.join([folded[start:end] for start, end in spans]))
+                if bucket is None:
+                    continue
+                if isinstance(bucket, list):
+                    candidates.update(bucket)
+                else:
+                    candidates.add(bucket)
+
+        # Confusions are free once folded, so the plain edit distance of the folded plates is a
+        # lower bound on the cost; it is cheap to compute and rejects most candidates
+        masks = {}
+        for position, char in enumerate(folded):
+            masks[char] = masks.get(char, 0) | (1 << position)
+
+        results = []
+        for entry in candidates:
+            candidate = self._plates[entry]
+            if _unit_edit_distance(masks, len(folded), candidate.translate(self._fold_table)) > max_cost:
+                continue
+            cost = self.distance(query, candidate, max_cost)
+            if cost <= max_cost:
+                results.append((candidate, cost))
+        results.sort(key=lambda item: (item[1], item[0]))
+        return results
+
+
+def _unit_edit_distance(masks, length, text):
+    """
+    Edit distance between a pattern and text, bit-parallel over the pattern (Myers 1999).
+    masks: {char: bit mask of the pattern positions holding char}; length: pattern length.
+    """
+    if length == 0:
+        return len(text)
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    positive, negative, score = full, 0, length
+    for char in text:
+        equal = masks.get(char, 0)
+        vertical = equal | negative
+        horizontal = ((((equal & positive) + positive) & full) ^ positive) | equal
+        up = negative | (~(horizontal | positive) & full)
+        down = positive & horizontal
+        if up & last:
+            score += 1
+        elif down & last:
+            score -= 1
+        up = ((up << 1) | 1) & full
+        down = (down << 1) & full
+        positive = down | (~(vertical | up) & full)
+        negative = up & vertical
+    return score
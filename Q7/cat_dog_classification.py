@@ -1,130 +1,430 @@
+import argparse
+import ast
+import hashlib
+import json
+import sqlite3
+import numpy as np
 import torch
-import torchvision.models as models
-from torchvision import transforms
+from torch.utils.data import Dataset, DataLoader
 from PIL import Image
 import os
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+import time
 import csv
 
+# torchvision (only for --export-model / building from downloaded weights), onnxruntime
+# (only for .onnx models) and reportlab (only when the PDF is written) are imported on demand
+
 # ---------- SETTINGS ----------
 image_folder = r"C:\Users\Home\Desktop\Nasir\Delloyd Internship\Q7\dog_cat_images"
 report_name = "dog_cat_classification_report.pdf"
 csv_name = "classification_results.csv"
+image_extensions = (".jpg", ".jpeg", ".png", ".jfif", ".webp")
 
-# ---------- MODEL ----------
-device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
-model = models.resnet50(weights=models.ResNet50_Weights.DEFAULT)
-model = model.to(device).eval()
+batch_size = 32
+num_workers = min(4, os.cpu_count() or 1)  # processes decoding and transforming images
 
-# Load ImageNet class labels
-from torchvision.models import ResNet50_Weights
-categories = ResNet50_Weights.DEFAULT.meta["categories"]
+# Pre-exported model (TorchScript .pt or ONNX .onnx) loaded offline; see --export-model
+model_path = os.environ.get("CAT_DOG_MODEL", os.path.join("models", "resnet50.pt"))
+cache_path = os.environ.get("CAT_DOG_CACHE", "classification_cache.sqlite")
+cache_max_bytes = 64 * 2**20  # size the cache database may use before old predictions are evicted
+labels_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagenet1000_clsidx_to_labels.txt")
 
+# ---------- CLASSES ----------
 # Predefined dog & cat classes (using ImageNet index ranges)
 # Dog breeds = indices 151–268 (118 classes)
-dog_indices = list(range(151, 269))
-dog_classes = [categories[i] for i in dog_indices]
+dog_indices = frozenset(range(151, 269))
 
 # Domestic cats = indices 281–285 (5 classes)
-cat_indices = list(range(281, 286))
-cat_classes = [categories[i] for i in cat_indices]
+cat_indices = frozenset(range(281, 286))
+
+
+def category_of(class_id):
+    if class_id in dog_indices:
+        return "DOG"
+    if class_id in cat_indices:
+        return "CAT"
+    return "OTHER"
+
+# ---------- MODEL ----------
+device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
+model = None       # callable: batch tensor -> logits; built on first use, so DataLoader workers never load it
+categories = None  # ImageNet label of each class index
+
+
+def _categories_path(path):
+    return path + ".categories.json"
+
+
+def load_categories(path=None):
+    """Labels saved next to an exported model, else the bundled ImageNet list (first synonym of each class)"""
+    if path and os.path.exists(_categories_path(path)):
+        with open(_categories_path(path)) as f:
+            return json.load(f)
+
+    labels = {}
+    with open(labels_file) as f:
+        for line in f:
+            index, _, value = line.strip().strip('{}').partition(':')
+            if value:
+                labels[int(index)] = ast.literal_eval(value.strip().rstrip(',')).split(',')[0]
+    return [labels[i] for i in range(len(labels))]
+
+
+def build_torchvision_model():
+    """ResNet50 with ImageNet weights from torchvision (needs the weights cache or a download)"""
+    import torchvision.models as models
+    weights = models.ResNet50_Weights.DEFAULT
+    return models.resnet50(weights=weights).eval(), list(weights.meta["categories"])
+
+
+def load_exported_model(path):
+    """Load a TorchScript or ONNX export from a local file; never touches the network"""
+    if path.endswith(".onnx"):
+        import onnxruntime
+        providers = ["CUDAExecutionProvider", "CPUExecutionProvider"] if device.type == "cuda" else ["CPUExecutionProvider"]
+        session = onnxruntime.InferenceSession(path, providers=providers)
+        input_name = session.get_inputs()[0].name
+        return lambda x: torch.from_numpy(session.run(None, {input_name: x.cpu().numpy()})[0]).to(device)
+    return torch.jit.load(path, map_location=device).eval()
+
+
+def export_model(path):
+    """Save ResNet50 as TorchScript (.pt) or ONNX (.onnx) plus its labels, for offline loading"""
+    net, labels = build_torchvision_model()
+    example = torch.zeros(1, 3, 224, 224)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".onnx"):
+        torch.onnx.export(net, example, path, input_names=["input"], output_names=["logits"],
+                          dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}})
+    else:
+        with torch.no_grad():
+            traced = torch.jit.trace(net, example)
+        torch.jit.save(traced, path)
+    with open(_categories_path(path), "w") as f:
+        json.dump(labels, f)
+
+
+def get_model():
+    global model, categories
+    if model is None:
+        if os.path.exists(model_path):
+            model = load_exported_model(model_path)
+            categories = load_categories(model_path)
+        else:
+            print(f"⚠️  No exported model at {model_path}; building ResNet50 from torchvision weights")
+            net, categories = build_torchvision_model()
+            model = net.to(device)
+    return model
 
 
 # ---------- TRANSFORMS ----------
-transform = transforms.Compose([
-    transforms.Resize(256),
-    transforms.CenterCrop(224),
-    transforms.ToTensor(),
-    transforms.Normalize(
-        mean=[0.485, 0.456, 0.406],
-        std=[0.229, 0.224, 0.225]
-    ),
-])
+# Same as transforms.Compose([Resize(256), CenterCrop(224), ToTensor(), Normalize(mean, std)])
+# done directly with PIL and torch, so torchvision is not imported for inference
+mean = torch.tensor([0.485, 0.456, 0.406]).view(3, 1, 1)
+std = torch.tensor([0.229, 0.224, 0.225]).view(3, 1, 1)
+
+
+def transform(img, resize=256, crop=224):
+    width, height = img.size
+    if width <= height:
+        size = (resize, int(resize * height / width))
+    else:
+        size = (int(resize * width / height), resize)
+    if size != img.size:
+        img = img.resize(size, Image.BILINEAR)
+    left = int(round((size[0] - crop) / 2.0))
+    top = int(round((size[1] - crop) / 2.0))
+    img = img.crop((left, top, left + crop, top + crop))
+    x = torch.from_numpy(np.array(img, dtype=np.uint8)).permute(2, 0, 1).float().div(255)
+    return (x - mean) / std
 
 # ---------- PREDICTION FUNCTION ----------
 def predict_image(img_path):
     img = Image.open(img_path).convert("RGB")
     x = transform(img).unsqueeze(0).to(device)
-    with torch.no_grad():
-        out = model(x)
+    with torch.inference_mode():
+        out = get_model()(x)
     probs = torch.nn.functional.softmax(out[0], dim=0)
     top_prob, top_id = torch.topk(probs, 1)
-    return categories[top_id], float(top_prob)
-
-# ---------- CLASSIFICATION ----------
-predicted_cats, predicted_dogs, misclassified = [], [], []
-
-for fname in os.listdir(image_folder):
-    if not fname.lower().endswith((".jpg", ".jpeg", ".png", ".jfif", ".webp")):
-        continue
-
-    img_path = os.path.join(image_folder, fname)
-    label, conf = predict_image(img_path)  # get top1 only
-
-    if label in dog_classes:
-        marker = "[DOG]"
-        output = f"{marker} {fname}  -->  {label}"
-        predicted_dogs.append((fname, label))
-    elif label in cat_classes:
-        marker = "[CAT]"
-        output = f"{marker} {fname}  -->  {label}"
-        predicted_cats.append((fname, label))
-    else:
-        marker = "[Misclassified DOg]"
-        output = f"{marker} {fname}  -->  {label}"
-        misclassified.append((fname, label))
+    return categories[int(top_id)], float(top_prob)
+
+
+class ImageDataset(Dataset):
+    """Decodes and transforms images inside DataLoader workers; yields (tensor, position)"""
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, index):
+        img = Image.open(self.paths[index]).convert("RGB")
+        return transform(img), index
+
+
+def predict_images(img_paths, batch_size=batch_size, num_workers=num_workers):
+    """
+    Top-1 (label, confidence, class index) for every image, in input order
+    Worker processes decode and transform the next batches while the model runs on the current one
+    """
+    img_paths = list(img_paths)
+    loader = DataLoader(ImageDataset(img_paths), batch_size=batch_size, shuffle=False,
+                        num_workers=num_workers, pin_memory=device.type == "cuda")
+    net = get_model()
+    results = [None] * len(img_paths)
+    with torch.inference_mode():
+        for x, positions in loader:
+            out = net(x.to(device, non_blocking=True))
+            top_prob, top_id = torch.topk(torch.nn.functional.softmax(out, dim=1), 1, dim=1)
+            for position, class_id, prob in zip(positions.tolist(), top_id[:, 0].tolist(), top_prob[:, 0].tolist()):
+                results[position] = (categories[class_id], prob, class_id)
+    return results
+
+
+# ---------- RESULT CACHE ----------
+preprocess_version = "resize256-crop224-v1"  # bump when transform() changes
+
+
+def file_sha256(path):
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_version(path):
+    """Identifies the model and preprocessing that produced a prediction, without loading the model"""
+    if os.path.exists(path):
+        return f"sha256:{file_sha256(path)}/{preprocess_version}"
+    # The weights file name carries its hash, so a new DEFAULT does not reuse old predictions
+    import torchvision.models as models
+    return f"torchvision:{models.ResNet50_Weights.DEFAULT.url}/{preprocess_version}"
+
+
+class ResultCache:
+    """
+    Predictions stored in SQLite, keyed by image content hash and model version
+    Renamed or moved images are still hits; the least recently used rows are evicted
+    once the database uses more than max_bytes.
+    """
+
+    def __init__(self, path, version, max_bytes=cache_max_bytes):
+        self.version = version
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(path)
+        # Lets store() return evicted pages to the file system (only takes effect on a new file)
+        self.db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS predictions (
+                               image_hash TEXT NOT NULL,
+                               model TEXT NOT NULL,
+                               class_id INTEGER NOT NULL,
+                               label TEXT NOT NULL,
+                               confidence REAL NOT NULL,
+                               last_used REAL NOT NULL,
+                               PRIMARY KEY (image_hash, model))""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS predictions_last_used ON predictions (last_used)")
+
+    def lookup(self, image_hashes):
+        """{image hash: (label, confidence, class index)} for the hashes already classified"""
+        found = {}
+        unique = list(dict.fromkeys(image_hashes))
+        for start in range(0, len(unique), 500):  # stay under SQLite's bound-parameter limit
+            chunk = unique[start:start + 500]
+            rows = self.db.execute(
+                f"SELECT image_hash, label, confidence, class_id FROM predictions "
+                f"WHERE model = ? AND image_hash IN ({','.join('?' * len(chunk))})", [self.version, *chunk])
+            for image_hash, label, confidence, class_id in rows:
+                found[image_hash] = (label, confidence, class_id)
+        with self.db:
+            self.db.executemany("UPDATE predictions SET last_used = ? WHERE image_hash = ? AND model = ?",
+                                [(time.time(), image_hash, self.version) for image_hash in found])
+        return found
+
+    def store(self, results):
+        """results: {image hash: (label, confidence, class index)}"""
+        now = time.time()
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?)",
+                                [(image_hash, self.version, class_id, label, confidence, now)
+                                 for image_hash, (label, confidence, class_id) in results.items()])
+            removed = self.evict()
+        if removed:
+            # Return the freed pages to the file system; executescript runs the pragma to completion,
+            # a plain execute() would only release a single page
+            self.db.executescript("PRAGMA incremental_vacuum;")
+
+    def size_bytes(self):
+        """Bytes of the database file in use (pages on the free list are not counted)"""
+        page_size, page_count, free_pages = (self.db.execute(f"PRAGMA {name}").fetchone()[0]
+                                             for name in ("page_size", "page_count", "freelist_count"))
+        return (page_count - free_pages) * page_size
+
+    def evict(self):
+        """Drop the least recently used rows until the database fits in max_bytes; returns how many were removed"""
+        removed = 0
+        size = self.size_bytes()
+        while size > self.max_bytes:
+            rows = len(self)
+            if rows == 0:
+                break
+            # Rows are about the same size: remove the estimated excess (at least 2% per round)
+            excess = max(int(rows * (1 - self.max_bytes / size)), rows // 50, 1)
+            removed += self.db.execute("DELETE FROM predictions WHERE rowid IN "
+                                       "(SELECT rowid FROM predictions ORDER BY last_used LIMIT ?)",
+                                       (excess,)).rowcount
+            size = self.size_bytes()
+        return removed
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+def classify_with_cache(img_paths, cache, batch_size=batch_size, num_workers=num_workers):
+    """predict_images for only the images the cache has not seen; returns (results in input order, new count)"""
+    image_hashes = [file_sha256(path) for path in img_paths]
+    known = cache.lookup(image_hashes)
+
+    # Identical files are classified once
+    missing = {}
+    for path, image_hash in zip(img_paths, image_hashes):
+        if image_hash not in known:
+            missing.setdefault(image_hash, path)
+    if missing:
+        predictions = predict_images(list(missing.values()), batch_size, num_workers)
+        new = dict(zip(missing, predictions))
+        cache.store(new)
+        known.update(new)
+    return [known[image_hash] for image_hash in image_hashes], len(missing)
 
-    print(output)
 
 # ---------- PDF REPORT ----------
-styles = getSampleStyleSheet()
-doc = SimpleDocTemplate(report_name, pagesize=A4)
-story = []
-
-story.append(Paragraph("<b>Dog & Cat Image Classification Report</b>", styles['Title']))
-story.append(Spacer(1, 12))
-
-total_images = len([f for f in os.listdir(image_folder)
-                    if f.lower().endswith(('.jpg', '.jpeg', '.png', '.jfif', '.webp'))])
-story.append(Paragraph(f"Total images checked: {total_images}", styles['Normal']))
-story.append(Paragraph(f"Predicted as dogs: {len(predicted_dogs)}", styles['Normal']))
-story.append(Paragraph(f"Predicted as cats: {len(predicted_cats)}", styles['Normal']))
-story.append(Paragraph(f"Other: {len(misclassified)}", styles['Normal']))
-story.append(Spacer(1, 12))
-
-if predicted_dogs:
-    story.append(Paragraph("<b>Dog Predictions</b>", styles['Heading2']))
-    for fname, label in predicted_dogs:
-        story.append(Paragraph(f"{fname}: {label}", styles['Normal']))
-    story.append(Spacer(1, 12))
+def write_pdf_report(total_images, predicted_dogs, predicted_cats, misclassified):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(report_name, pagesize=A4)
+    story = []
 
-if predicted_cats:
-    story.append(Paragraph("<b>Cat Predictions</b>", styles['Heading2']))
-    for fname, label in predicted_cats:
-        story.append(Paragraph(f"{fname}: {label}", styles['Normal']))
+    story.append(Paragraph("<b>Dog & Cat Image Classification Report</b>", styles['Title']))
     story.append(Spacer(1, 12))
 
-if misclassified:
-    story.append(Paragraph("<b>Other Predictions</b>", styles['Heading2']))
-    for fname, label in misclassified:
-        story.append(Paragraph(f"{fname}: {label}", styles['Normal']))
+    story.append(Paragraph(f"Total images checked: {total_images}", styles['Normal']))
+    story.append(Paragraph(f"Predicted as dogs: {len(predicted_dogs)}", styles['Normal']))
+    story.append(Paragraph(f"Predicted as cats: {len(predicted_cats)}", styles['Normal']))
+    story.append(Paragraph(f"Other: {len(misclassified)}", styles['Normal']))
     story.append(Spacer(1, 12))
 
-doc.build(story)
-print(f"\nPDF report saved as: {report_name}")
+    if predicted_dogs:
+        story.append(Paragraph("<b>Dog Predictions</b>", styles['Heading2']))
+        for fname, label in predicted_dogs:
+            story.append(Paragraph(f"{fname}: {label}", styles['Normal']))
+        story.append(Spacer(1, 12))
+
+    if predicted_cats:
+        story.append(Paragraph("<b>Cat Predictions</b>", styles['Heading2']))
+        for fname, label in predicted_cats:
+            story.append(Paragraph(f"{fname}: {label}", styles['Normal']))
+        story.append(Spacer(1, 12))
+
+    if misclassified:
+        story.append(Paragraph("<b>Other Predictions</b>", styles['Heading2']))
+        for fname, label in misclassified:
+            story.append(Paragraph(f"{fname}: {label}", styles['Normal']))
+        story.append(Spacer(1, 12))
+
+    doc.build(story)
+    print(f"\nPDF report saved as: {report_name}")
+
+
+def main():
+    global model_path
+    parser = argparse.ArgumentParser(description="Classify a folder of images as dogs, cats or other")
+    parser.add_argument('--folder', default=image_folder, help="Folder with the images")
+    parser.add_argument('--batch-size', type=int, default=batch_size, help="Images per model call")
+    parser.add_argument('--workers', type=int, default=num_workers,
+                        help="Processes decoding images (0: decode in the main process)")
+    parser.add_argument('--model', default=model_path, help="Exported TorchScript (.pt) or ONNX (.onnx) model")
+    parser.add_argument('--export-model', metavar='PATH',
+                        help="Export ResNet50 from torchvision weights to PATH (.pt or .onnx) and exit")
+    parser.add_argument('--no-pdf', action='store_true', help="Skip the PDF report")
+    parser.add_argument('--cache', default=cache_path, help="SQLite file with cached predictions")
+    parser.add_argument('--no-cache', action='store_true', help="Classify every image again, without the cache")
+    parser.add_argument('--cache-max-bytes', type=int, default=cache_max_bytes,
+                        help="Size the cache database may use (least recently used predictions are evicted)")
+    args = parser.parse_args()
+
+    if args.export_model:
+        export_model(args.export_model)
+        print(f"Model exported to: {args.export_model}")
+        return
+    model_path = args.model
+
+    # ---------- CLASSIFICATION ----------
+    predicted_cats, predicted_dogs, misclassified = [], [], []
+
+    fnames = [fname for fname in os.listdir(args.folder) if fname.lower().endswith(image_extensions)]
+    img_paths = [os.path.join(args.folder, fname) for fname in fnames]
+    start = time.perf_counter()
+    if args.no_cache:
+        predictions = predict_images(img_paths, args.batch_size, args.workers)
+        classified = len(fnames)
+    else:
+        cache = ResultCache(args.cache, model_version(model_path), args.cache_max_bytes)
+        try:
+            predictions, classified = classify_with_cache(img_paths, cache, args.batch_size, args.workers)
+        finally:
+            cache.close()
+    elapsed = time.perf_counter() - start
+
+    for fname, (label, conf, class_id) in zip(fnames, predictions):  # top1 only
+        category = category_of(class_id)
+        if category == "DOG":
+            marker = "[DOG]"
+            output = f"{marker} {fname}  -->  {label}"
+            predicted_dogs.append((fname, label))
+        elif category == "CAT":
+            marker = "[CAT]"
+            output = f"{marker} {fname}  -->  {label}"
+            predicted_cats.append((fname, label))
+        else:
+            marker = "[Misclassified DOg]"
+            output = f"{marker} {fname}  -->  {label}"
+            misclassified.append((fname, label))
+
+        print(output)
+
+    if classified:
+        rate = f" ({classified / elapsed:.1f} images/s)" if elapsed > 0 else ""
+        print(f"\nClassified {classified} images in {elapsed:.2f}s{rate}")
+    if classified < len(fnames):
+        print(f"Reused {len(fnames) - classified} cached predictions from {args.cache}")
+
+    if not args.no_pdf:
+        write_pdf_report(len(fnames), predicted_dogs, predicted_cats, misclassified)
+
+    # ---------- CSV REPORT ----------
+    with open(csv_name, mode="w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Image", "Category", "Label"])
+
+        for fname, label in predicted_dogs:
+            writer.writerow([fname, "DOG", label])
+        for fname, label in predicted_cats:
+            writer.writerow([fname, "CAT", label])
+        for fname, label in misclassified:
+            writer.writerow([fname, "MIsclassified Dog", label])
 
-# ---------- CSV REPORT ----------
-with open(csv_name, mode="w", newline="") as f:
-    writer = csv.writer(f)
-    writer.writerow(["Image", "Category", "Label"])
+    print(f"CSV results saved as: {csv_name}")
 
-    for fname, label in predicted_dogs:
-        writer.writerow([fname, "DOG", label])
-    for fname, label in predicted_cats:
-        writer.writerow([fname, "CAT", label])
-    for fname, label in misclassified:
-        writer.writerow([fname, "MIsclassified Dog", label])
 
-print(f"CSV results saved as: {csv_name}")
+# Worker processes re-import this module on Windows/macOS, so nothing runs at import time
+if __name__ == "__main__":
+    main()
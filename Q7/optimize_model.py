@@ -0,0 +1,167 @@
+"""
+Optimized CPU inference for the cat/dog classifier
+
+Builds a channels-last, traced and frozen ResNet50 (FP32), optionally quantized to int8
+with post-training static quantization calibrated on a sample folder, checks that its
+DOG/CAT/OTHER decisions agree with the eager FP32 model, and reports the speedup and the
+reduction in saved model file size. The result is saved as TorchScript, so
+cat_dog_classification.py can load it:
+
+    python optimize_model.py --mode int8 --output models/resnet50_int8.pt
+    python cat_dog_classification.py --model models/resnet50_int8.pt
+"""
+
+import argparse
+import copy
+import io
+import json
+import os
+import time
+
+import torch
+from torch.utils.data import DataLoader
+
+from cat_dog_classification import ImageDataset, build_torchvision_model, category_of, image_extensions
+
+default_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dog_cat_images")
+
+
+def load_batches(folder, batch_size=16, limit=None):
+    """Preprocessed image batches of a folder (decoded once, reused by every model)"""
+    fnames = sorted(f for f in os.listdir(folder) if f.lower().endswith(image_extensions))[:limit]
+    loader = DataLoader(ImageDataset([os.path.join(folder, f) for f in fnames]), batch_size=batch_size)
+    return fnames, [x for x, _ in loader]
+
+
+def quantization_engine():
+    engines = torch.backends.quantized.supported_engines
+    return next((engine for engine in ("x86", "fbgemm", "qnnpack") if engine in engines), None)
+
+
+def quantize_int8(net, calibration_batches):
+    """Post-training static int8 quantization (FX graph mode), calibrated on sample batches"""
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    engine = quantization_engine()
+    if engine is None:
+        raise RuntimeError("This PyTorch build has no quantized CPU engine")
+    torch.backends.quantized.engine = engine
+
+    example = calibration_batches[0][:1]
+    prepared = prepare_fx(copy.deepcopy(net).eval(), get_default_qconfig_mapping(engine), (example,))
+    with torch.inference_mode():
+        for x in calibration_batches:
+            prepared(x)
+    return convert_fx(prepared)
+
+
+class ChannelsLastInput(torch.nn.Module):
+    """Converts NCHW batches to channels-last inside the graph, so callers pass plain batches"""
+
+    def __init__(self, net):
+        super().__init__()
+        self.net = net
+
+    def forward(self, x):
+        return self.net(x.contiguous(memory_format=torch.channels_last))
+
+
+def compile_graph(net, example, quantized=False):
+    """Channels-last memory format, traced and frozen into an optimized TorchScript graph"""
+    net = ChannelsLastInput(copy.deepcopy(net).to(memory_format=torch.channels_last)).eval()
+    with torch.no_grad():
+        frozen = torch.jit.freeze(torch.jit.trace(net, example))
+        # Conv/BN folding and oneDNN layouts only apply to float graphs
+        return frozen if quantized else torch.jit.optimize_for_inference(frozen)
+
+
+def predict_classes(net, batches):
+    class_ids = []
+    with torch.inference_mode():
+        for x in batches:
+            class_ids.extend(net(x).argmax(dim=1).tolist())
+    return class_ids
+
+
+def images_per_second(net, batches, repeats=3):
+    """Best of several timed passes over the preloaded NCHW batches (model time only)"""
+    predict_classes(net, batches[:1])  # warmup
+    images = sum(len(x) for x in batches)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict_classes(net, batches)
+        best = min(best, time.perf_counter() - start)
+    return images / best
+
+
+def serialized_size(net):
+    """File size in bytes of the saved model (state dict for eager modules, the archive for TorchScript)"""
+    buffer = io.BytesIO()
+    if isinstance(net, torch.jit.ScriptModule):
+        torch.jit.save(net, buffer)
+    else:
+        torch.save(net.state_dict(), buffer)
+    return buffer.tell()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and check an optimized CPU model for cat/dog classification")
+    parser.add_argument('--mode', choices=['fp32', 'int8'], default='int8',
+                        help="fp32: channels-last traced graph only; int8: also quantize")
+    parser.add_argument('--folder', default=default_folder, help="Images for the accuracy check")
+    parser.add_argument('--calibration', default=None, help="Calibration images (default: --folder)")
+    parser.add_argument('--calibration-images', type=int, default=64)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--threads', type=int, default=None, help="torch CPU threads")
+    parser.add_argument('--output', default=None, help="Save the optimized TorchScript model here")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    fnames, batches = load_batches(args.folder, args.batch_size)
+    if not batches:
+        raise SystemExit(f"No images found in {args.folder}")
+    net, categories = build_torchvision_model()
+
+    optimized = net
+    if args.mode == 'int8':
+        _, calibration = load_batches(args.calibration or args.folder, args.batch_size, args.calibration_images)
+        print(f"Calibrating int8 quantization on {sum(len(x) for x in calibration)} images ({quantization_engine()})")
+        optimized = quantize_int8(net, calibration)
+    optimized = compile_graph(optimized, batches[0], quantized=args.mode == 'int8')
+
+    # ---------- ACCURACY CHECK ----------
+    reference = predict_classes(net, batches)
+    candidate = predict_classes(optimized, batches)
+    disagreements = [(fname, a, b) for fname, a, b in zip(fnames, reference, candidate)
+                     if category_of(a) != category_of(b)]
+    same_label = sum(a == b for a, b in zip(reference, candidate))
+    print(f"\nCategory agreement with FP32: {len(fnames) - len(disagreements)}/{len(fnames)} "
+          f"({100 * (1 - len(disagreements) / len(fnames)):.1f}%), same top-1 label: {same_label}/{len(fnames)}")
+    for fname, a, b in disagreements:
+        print(f"  {fname}: {categories[a]} [{category_of(a)}] -> {categories[b]} [{category_of(b)}]")
+
+    # ---------- SPEED & FILE SIZE ----------
+    # Batches are plain NCHW tensors, exactly what cat_dog_classification.py passes in
+    fp32_speed = images_per_second(net, batches)
+    optimized_speed = images_per_second(optimized, batches)
+    fp32_size = serialized_size(net)
+    optimized_size = serialized_size(optimized)
+    print(f"\nFP32 eager:   {fp32_speed:7.1f} images/s   file size {fp32_size / 2**20:6.1f} MB")
+    print(f"{args.mode.upper()} graph:   {optimized_speed:7.1f} images/s   file size {optimized_size / 2**20:6.1f} MB")
+    print(f"Speedup: {optimized_speed / fp32_speed:.2f}x, file size: {optimized_size / fp32_size:.2f}x "
+          f"({(1 - optimized_size / fp32_size) * 100:.0f}% smaller)")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        torch.jit.save(optimized, args.output)
+        with open(args.output + ".categories.json", "w") as f:
+            json.dump(categories, f)
+        print(f"\nOptimized model saved as: {args.output}")
+
+
+if __name__ == "__main__":
+    main()